@@ -0,0 +1,173 @@
+"""Concurrent throughput of the read API and login under ASGI versus WSGI.
+
+Seeds a temporary SQLite database, then starts each server on it in turn and
+drives it with keep-alive client threads for a fixed time per concurrency
+level. The ASGI server gets core.asgi, so the hot reads and login are served
+by the native async views; the WSGI server runs the DRF views. Requires
+uvicorn and gunicorn, which are not part of requirements.txt::
+
+    pip install uvicorn gunicorn
+    python -m benchmarks.async_throughput --concurrency 1 8 32 --duration 10
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from importlib.util import find_spec
+from pathlib import Path
+
+workdir = tempfile.mkdtemp(prefix="kanmind-bench-")
+os.environ["BENCHMARK_DATABASE"] = str(Path(workdir) / "bench.sqlite3")
+os.environ["DJANGO_SETTINGS_MODULE"] = "benchmarks.settings"
+os.environ.setdefault("SQLITE_PROFILE", "production")
+
+from benchmarks import environment  # noqa: E402,F401  configures Django first
+
+from django.core.management import call_command  # noqa: E402
+
+from benchmarks import seed  # noqa: E402
+from boards_app.models import Board  # noqa: E402
+from tasks_app.models import Task  # noqa: E402
+
+ROOT = Path(__file__).resolve().parent.parent
+PORT = 8765
+
+
+def servers(workers, threads):
+    return {
+        "wsgi (gunicorn)": [
+            sys.executable, "-m", "gunicorn", "core.wsgi:application", "--bind", f"127.0.0.1:{PORT}",
+            "--workers", str(workers), "--threads", str(threads), "--log-level", "warning",
+        ],
+        "asgi (uvicorn)": [
+            sys.executable, "-m", "uvicorn", "core.asgi:application", "--port", str(PORT),
+            "--workers", str(workers), "--log-level", "warning", "--no-access-log",
+        ],
+    }
+
+
+def wait_for_port(timeout=20):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", PORT), timeout=0.2).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("server did not start")
+
+
+def request_mix(users, login_share):
+    """Return a function that picks the next (method, path, body, token) to send."""
+    visible = {}
+    for user in users:
+        boards = list(Board.objects.visible_to(user).values_list("pk", flat=True))
+        tasks = list(Task.objects.filter(board__in=boards).values_list("pk", flat=True)[:200])
+        if boards and tasks:
+            visible[user] = (boards, tasks)
+    users = list(visible)
+    reads = ["/api/boards/", "/api/tasks/", "/api/tasks/assigned-to-me/", "/api/tasks/reviewing/"]
+
+    def pick():
+        user = random.choice(users)
+        if random.random() < login_share:
+            body = json.dumps({"email": user.email, "password": "benchmark-password"})
+            return "POST", "/api/login/", body, None
+        boards, tasks = visible[user]
+        path = random.choice(reads + [f"/api/boards/{random.choice(boards)}/", f"/api/tasks/{random.choice(tasks)}/comments/"])
+        return "GET", path, None, user.auth_token.key
+
+    return pick
+
+
+def drive(concurrency, duration, pick):
+    latencies, errors = [], []
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def client():
+        connection = http.client.HTTPConnection("127.0.0.1", PORT, timeout=30)
+        samples, failed = [], 0
+        while time.monotonic() < deadline:
+            method, path, body, token = pick()
+            headers = {"Content-Type": "application/json"}
+            if token:
+                headers["Authorization"] = f"Token {token}"
+            start = time.perf_counter()
+            try:
+                connection.request(method, path, body=body, headers=headers)
+                response = connection.getresponse()
+                response.read()
+                if response.status >= 400:
+                    failed += 1
+            except (OSError, http.client.HTTPException):
+                failed += 1
+                connection.close()
+                connection = http.client.HTTPConnection("127.0.0.1", PORT, timeout=30)
+                continue
+            samples.append((time.perf_counter() - start) * 1000)
+        with lock:
+            latencies.extend(samples)
+            errors.append(failed)
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    latencies.sort()
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] if latencies else 0
+    return len(latencies) / duration, statistics.median(latencies) if latencies else 0, p95, sum(errors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 8, 32])
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--threads", type=int, default=8, help="gunicorn threads per worker")
+    parser.add_argument("--login-share", type=float, default=0.05, help="fraction of requests that log in")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--boards", type=int, default=100)
+    parser.add_argument("--tasks-per-board", type=int, default=50)
+    args = parser.parse_args()
+
+    missing = [name for name in ("uvicorn", "gunicorn") if find_spec(name) is None]
+    if missing:
+        sys.exit(f"Install {' and '.join(missing)} to run this benchmark.")
+
+    try:
+        call_command("migrate", verbosity=0)
+        data = seed.seed(
+            users=args.users, boards=args.boards, members_per_board=5,
+            tasks_per_board=args.tasks_per_board, comments_per_task=2,
+        )
+        pick = request_mix(data["users"], args.login_share)
+
+        print(f"{'server':<16} {'clients':>7} {'req/s':>9} {'p50':>9} {'p95':>9} {'errors':>7}")
+        for name, command in servers(args.workers, args.threads).items():
+            process = subprocess.Popen(command, cwd=ROOT, env=os.environ.copy())
+            try:
+                wait_for_port()
+                drive(2, 1, pick)  # warm caches and connections
+                for concurrency in args.concurrency:
+                    rate, p50, p95, errors = drive(concurrency, args.duration, pick)
+                    print(f"{name:<16} {concurrency:>7} {rate:>9.1f} {p50:>7.2f}ms {p95:>7.2f}ms {errors:>7}")
+            finally:
+                process.terminate()
+                process.wait()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""Latency and query count of every API route on a seeded database.
+
+Each route runs once on cold caches (the query count a first request pays)
+and then ``--repeat`` times warm for p50/p95 latency and the steady-state
+query count::
+
+    python -m benchmarks.endpoints --users 50 --boards 100 --tasks-per-board 50
+
+The admin site and the server-sent events stream (which never completes)
+are left out.
+"""
+import argparse
+import itertools
+import statistics
+import time
+
+from benchmarks.environment import test_database  # configures Django first
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from benchmarks import seed
+from benchmarks.testing import busiest_user, reset_caches
+from boards_app.models import Board
+from tasks_app.models import Comment, Task
+
+
+class Case:
+    """One route; ``prepare`` creates whatever a destructive call consumes."""
+
+    def __init__(self, name, method, path, body=None, prepare=None, auth=True):
+        self.name = name
+        self.method = method
+        self.path = path
+        self.body = body
+        self.prepare = prepare
+        self.auth = auth
+
+    def call(self, client, context):
+        extra = self.prepare(context) if self.prepare else {}
+        values = {**context, **extra}
+        path = self.path.format(**values)
+        body = self.body(values) if callable(self.body) else self.body
+        if not self.auth:
+            client = APIClient()
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            response = getattr(client, self.method)(path, body, format="json")
+            elapsed = (time.perf_counter() - start) * 1000
+        if response.status_code >= 400:
+            raise RuntimeError(f"{self.name}: {response.status_code} {response.content[:200]!r}")
+        return elapsed, len(queries.captured_queries)
+
+
+def new_board(context):
+    return {"doomed": Board.objects.create(title="Benchmark", owner=context["user"]).pk}
+
+
+def new_task(context):
+    task = Task.objects.create(board_id=context["board"], title="Benchmark", created_by=context["user"])
+    return {"doomed": task.pk}
+
+
+def new_comment(context):
+    comment = Comment.objects.create(task_id=context["task"], author=context["user"], content="Benchmark")
+    return {"doomed": comment.pk}
+
+
+registrations = itertools.count()
+
+
+def new_account(context):
+    number = next(registrations)
+    return {"fullname": f"Bench {number}", "email": f"bench{number}@example.com"}
+
+
+CASES = [
+    Case("registration", "post", "/api/registration/", auth=False, prepare=new_account, body=lambda v: {
+        "fullname": v["fullname"], "email": v["email"], "password": "pw", "repeated_password": "pw"}),
+    Case("login", "post", "/api/login/", auth=False,
+         body=lambda v: {"email": v["user"].email, "password": "benchmark-password"}),
+    Case("email-check", "get", "/api/email-check/?email={other_email}"),
+    Case("email-check batch", "post", "/api/email-check/batch/",
+         body=lambda v: {"emails": v["emails"] + ["nobody@example.com"]}),
+    Case("board list", "get", "/api/boards/"),
+    Case("board active list", "get", "/api/boards/active/"),
+    Case("board create", "post", "/api/boards/", body={"title": "Benchmark"}),
+    Case("board detail", "get", "/api/boards/{board}/"),
+    Case("board update", "patch", "/api/boards/{board}/", body={"title": "Renamed"}),
+    Case("board changes", "get", "/api/boards/{board}/changes/?since=0"),
+    Case("board deactivate", "post", "/api/boards/{board}/deactivate/"),
+    Case("board delete", "delete", "/api/boards/{doomed}/", prepare=new_board),
+    Case("task list", "get", "/api/tasks/"),
+    Case("task create", "post", "/api/tasks/", body=lambda v: {"board": v["board"], "title": "Benchmark"}),
+    Case("task detail", "get", "/api/tasks/{task}/"),
+    Case("task update", "patch", "/api/tasks/{task}/", body={"status": "review"}),
+    Case("task delete", "delete", "/api/tasks/{doomed}/", prepare=new_task),
+    Case("task bulk", "post", "/api/tasks/bulk/", body=lambda v: {"operations": [
+        {"op": "create", "data": {"board": v["board"], "title": f"Bulk {i}"}} for i in range(20)]}),
+    Case("assigned-to-me", "get", "/api/tasks/assigned-to-me/"),
+    Case("reviewing", "get", "/api/tasks/reviewing/"),
+    Case("comment list", "get", "/api/tasks/{task}/comments/"),
+    Case("comment create", "post", "/api/tasks/{task}/comments/", body={"content": "Benchmark"}),
+    Case("comment delete", "delete", "/api/tasks/{task}/comments/{doomed}/", prepare=new_comment),
+    Case("metrics", "get", "/api/metrics/"),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--boards", type=int, default=100)
+    parser.add_argument("--members-per-board", type=int, default=5)
+    parser.add_argument("--tasks-per-board", type=int, default=50)
+    parser.add_argument("--comments-per-task", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with test_database():
+        data = seed.seed(
+            users=args.users, boards=args.boards, members_per_board=args.members_per_board,
+            tasks_per_board=args.tasks_per_board, comments_per_task=args.comments_per_task,
+        )
+        user = busiest_user(data["users"])
+        user.is_staff = True
+        user.save()
+        board = Board.objects.filter(owner=user).order_by("pk").first()
+        context = {
+            "user": user,
+            "board": board.pk,
+            "task": board.tasks.order_by("pk").first().pk,
+            "other_email": data["users"][-1].email,
+            "emails": [other.email for other in data["users"][:20]],
+        }
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Token {user.auth_token.key}")
+
+        print(f"{'route':<20} {'cold q':>7} {'warm q':>7} {'p50':>9} {'p95':>9}")
+        for case in CASES:
+            reset_caches()
+            _, cold_queries = case.call(client, context)
+            samples = [case.call(client, context) for _ in range(args.repeat)]
+            latencies = sorted(elapsed for elapsed, _ in samples)
+            p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+            print(
+                f"{case.name:<20} {cold_queries:>7} {samples[-1][1]:>7}"
+                f" {statistics.median(latencies):>7.2f}ms {p95:>7.2f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Fast bulk seeding of users, boards, members, tasks and comments.
+
+Rows are written with ``bulk_create`` so signals do not fire; board
+statistics and comment counts are recounted once at the end instead.
+"""
+import random
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from rest_framework.authtoken.models import Token
+
+from boards_app.models import Board, BoardStats
+from tasks_app.models import Comment, Task
+from tasks_app.ranking import spread
+
+STATUSES = [value for value, _ in Task.STATUS_CHOICES]
+PRIORITIES = [value for value, _ in Task.PRIORITY_CHOICES]
+BATCH_SIZE = 5000
+
+
+def create_users(count, prefix="user"):
+    offset = User.objects.count()
+    password = make_password("benchmark-password")
+    users = User.objects.bulk_create(
+        [
+            User(username=f"{prefix}{offset + i}", email=f"{prefix}{offset + i}@example.com", password=password)
+            for i in range(count)
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    Token.objects.bulk_create([Token(user=user, key=Token.generate_key()) for user in users], batch_size=BATCH_SIZE)
+    return users
+
+
+def create_boards(owners, count, members_per_board=0, member_pool=None):
+    member_pool = member_pool or owners
+    boards = Board.objects.bulk_create(
+        [Board(title=f"Board {i}", owner=random.choice(owners)) for i in range(count)],
+        batch_size=BATCH_SIZE,
+    )
+    BoardStats.objects.bulk_create([BoardStats(board=board) for board in boards], batch_size=BATCH_SIZE)
+    Membership = Board.members.through
+    memberships = []
+    for board in boards:
+        for user in random.sample(member_pool, min(members_per_board, len(member_pool))):
+            memberships.append(Membership(board_id=board.pk, user_id=user.pk))
+    Membership.objects.bulk_create(memberships, batch_size=BATCH_SIZE, ignore_conflicts=True)
+    return boards
+
+
+def create_tasks(boards, users, count):
+    # Ascending keys in creation order also ascend within every column.
+    ranks = spread(count)
+    created = []
+    for start in range(0, count, BATCH_SIZE):
+        batch = [
+            Task(
+                board=random.choice(boards),
+                title=f"Task {start + i}",
+                description="Seeded benchmark task",
+                status=random.choice(STATUSES),
+                priority=random.choice(PRIORITIES),
+                assignee=random.choice(users),
+                reviewer=random.choice(users),
+                created_by=random.choice(users),
+                rank=ranks[start + i],
+            )
+            for i in range(min(BATCH_SIZE, count - start))
+        ]
+        created.extend(Task.objects.bulk_create(batch))
+    return created
+
+
+def create_comments(tasks, users, per_task):
+    comments = [
+        Comment(task=task, author=random.choice(users), content=f"Comment {i} on {task.title}")
+        for task in tasks
+        for i in range(per_task)
+    ]
+    return Comment.objects.bulk_create(comments, batch_size=BATCH_SIZE)
+
+
+def seed(users=10, boards=5, members_per_board=3, tasks_per_board=20, comments_per_task=2, seed_value=0):
+    """Populate the current database and return the created objects by kind."""
+    random.seed(seed_value)
+    user_objs = create_users(users)
+    board_objs = create_boards(user_objs, boards, members_per_board)
+    task_objs = []
+    for board in board_objs:
+        task_objs.extend(create_tasks([board], user_objs, tasks_per_board))
+    comment_objs = create_comments(task_objs, user_objs, comments_per_task)
+    BoardStats.objects.recount([board.pk for board in board_objs])
+    Task.objects.recount_comments([board.pk for board in board_objs])
+    return {"users": user_objs, "boards": board_objs, "tasks": task_objs, "comments": comment_objs}
@@ -0,0 +1,9 @@
+"""Settings for benchmark servers: a seeded throw-away database, no DEBUG query log."""
+import os
+
+from core.settings import *  # noqa: F401,F403
+from core.settings import DATABASES
+
+DEBUG = False
+ALLOWED_HOSTS = ["127.0.0.1", "localhost"]
+DATABASES["default"]["NAME"] = os.environ["BENCHMARK_DATABASE"]
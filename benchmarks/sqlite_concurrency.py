@@ -0,0 +1,121 @@
+"""Read/write throughput of SQLite under concurrent readers and writers.
+
+Each SQLite profile from core/settings.py runs in its own process against a
+fresh, seeded database file: reader threads fetch task and board lists while
+writer threads create tasks and comments in transactions (signals included).
+Connections are released between operations the way the request cycle does,
+so DB_CONN_MAX_AGE matters as it would in the server::
+
+    python -m benchmarks.sqlite_concurrency --readers 8 --writers 2 --duration 10
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+PROFILES = {
+    "stock (rollback journal, per-request connections)": {"SQLITE_PROFILE": "default", "DB_CONN_MAX_AGE": "0"},
+    "production (WAL, BEGIN IMMEDIATE, persistent)": {"SQLITE_PROFILE": "production", "DB_CONN_MAX_AGE": "600"},
+}
+
+
+def run_profile(args):
+    """Child process: seed, run the workload and print the counts as JSON."""
+    from benchmarks import environment  # noqa: F401  configures Django first
+
+    import random
+
+    from django.core.management import call_command
+    from django.db import OperationalError, close_old_connections, connection, transaction
+
+    from benchmarks import seed
+    from boards_app.models import Board
+    from tasks_app.models import Comment, Task
+
+    call_command("migrate", verbosity=0)
+    data = seed.seed(users=args.users, boards=args.boards, members_per_board=5, tasks_per_board=args.tasks_per_board)
+    users, boards, tasks = data["users"], data["boards"], data["tasks"]
+    close_old_connections()
+
+    counts = {"reads": 0, "writes": 0, "read_errors": 0, "write_errors": 0}
+    lock = threading.Lock()
+    deadline = time.monotonic() + args.duration
+
+    def read():
+        user = random.choice(users)
+        list(Task.objects.visible_to(user).for_response()[:50])
+        list(Board.objects.visible_to(user).with_list_counts())
+
+    def write():
+        with transaction.atomic():
+            task = Task.objects.create(
+                board=random.choice(boards), title="Benchmark task", created_by=random.choice(users),
+                status="to-do", priority="medium",
+            )
+            Comment.objects.create(task=random.choice(tasks), author=random.choice(users), content="Benchmark")
+            task.delete()
+
+    def worker(operation, kind):
+        done = failed = 0
+        while time.monotonic() < deadline:
+            try:
+                operation()
+                done += 1
+            except OperationalError:
+                failed += 1
+            close_old_connections()
+        connection.close()
+        with lock:
+            counts[f"{kind}s"] += done
+            counts[f"{kind}_errors"] += failed
+
+    threads = [threading.Thread(target=worker, args=(read, "read")) for _ in range(args.readers)]
+    threads += [threading.Thread(target=worker, args=(write, "write")) for _ in range(args.writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    print(json.dumps(counts))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--boards", type=int, default=50)
+    parser.add_argument("--tasks-per-board", type=int, default=100)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_profile(args)
+        return
+
+    print(f"{'profile':<52} {'reads/s':>9} {'writes/s':>9} {'locked':>7}")
+    for name, env in PROFILES.items():
+        with tempfile.TemporaryDirectory(prefix="kanmind-bench-") as workdir:
+            child_env = {
+                **os.environ, **env,
+                "DJANGO_SETTINGS_MODULE": "benchmarks.settings",
+                "BENCHMARK_DATABASE": str(Path(workdir) / "bench.sqlite3"),
+            }
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.sqlite_concurrency", "--child", *sys.argv[1:]],
+                cwd=Path(__file__).resolve().parent.parent, env=child_env, capture_output=True, text=True, check=True,
+            ).stdout
+        counts = json.loads(output.strip().splitlines()[-1])
+        print(
+            f"{name:<52} {counts['reads'] / args.duration:>9.1f} {counts['writes'] / args.duration:>9.1f}"
+            f" {counts['read_errors'] + counts['write_errors']:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
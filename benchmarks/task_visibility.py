@@ -0,0 +1,65 @@
+"""Task list/detail latency as the tasks table grows.
+
+The probing user sees a fixed set of tasks while unrelated tasks are added
+around them, so a visibility query that scales with the table shows up as
+growing latency. The legacy OR-of-joins + DISTINCT query is timed next to
+the current one for comparison::
+
+    python -m benchmarks.task_visibility --sizes 10000 100000 1000000
+"""
+import argparse
+
+from benchmarks.environment import measure, test_database  # configures Django first
+
+from rest_framework.test import APIClient
+
+from benchmarks import seed
+from tasks_app.models import Task
+
+
+def legacy_visible_tasks(user):
+    return (
+        Task.objects.filter(board__owner=user)
+        | Task.objects.filter(board__members=user)
+        | Task.objects.filter(assignee=user)
+        | Task.objects.filter(created_by=user)
+    ).distinct()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", nargs="+", type=int, default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--visible-tasks", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with test_database():
+        background_users = seed.create_users(50, prefix="background")
+        background_boards = seed.create_boards(background_users, 500, members_per_board=3)
+        probe = seed.create_users(1, prefix="probe")[0]
+        probe_board = seed.create_boards([probe], 1)[0]
+        probe_tasks = seed.create_tasks([probe_board], [probe], args.visible_tasks)
+
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Token {probe.auth_token.key}")
+        detail_url = f"/api/tasks/{probe_tasks[0].pk}/"
+
+        print(f"{'tasks':>10} {'list p50':>10} {'list p95':>10} {'detail p50':>11} {'current qs':>11} {'legacy qs':>10}")
+        total = Task.objects.count()
+        for size in sorted(args.sizes):
+            if size > total:
+                seed.create_tasks(background_boards, background_users, size - total)
+                total = size
+
+            list_p50, list_p95 = measure(lambda: client.get("/api/tasks/"), args.repeat)
+            detail_p50, _ = measure(lambda: client.get(detail_url), args.repeat)
+            current_p50, _ = measure(lambda: list(Task.objects.visible_to(probe)), args.repeat)
+            legacy_p50, _ = measure(lambda: list(legacy_visible_tasks(probe)), args.repeat)
+            print(
+                f"{total:>10} {list_p50:>8.2f}ms {list_p95:>8.2f}ms {detail_p50:>9.2f}ms"
+                f" {current_p50:>9.2f}ms {legacy_p50:>8.2f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
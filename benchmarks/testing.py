@@ -0,0 +1,44 @@
+"""Seeded test case base for the endpoint query-budget tests."""
+from django.core.cache import cache, caches
+from django.db.models import Count
+from rest_framework.test import APITestCase
+
+from benchmarks import seed
+from boards_app.models import Board
+from user_auth_app.authentication import local_tokens
+
+
+def reset_caches():
+    """Drop every cached token, board access and board list.
+
+    Test transactions roll back and reuse primary keys, so entries left over
+    from an earlier test would describe rows that no longer exist.
+    """
+    cache.clear()
+    caches["board_lists"].clear()
+    local_tokens.clear()
+
+
+def busiest_user(users):
+    """The board owner who is a member of the most boards, so budgets cover real fan-out."""
+    counts = dict(
+        Board.members.through.objects.values_list("user_id").annotate(boards=Count("board_id"))
+    )
+    owners = set(Board.objects.values_list("owner_id", flat=True))
+    return max((user for user in users if user.pk in owners), key=lambda user: counts.get(user.pk, 0))
+
+
+class SeededAPITestCase(APITestCase):
+    """APITestCase on a seeded database, authenticated as the busiest user."""
+    seed_options = {"users": 8, "boards": 6, "members_per_board": 4, "tasks_per_board": 15, "comments_per_task": 3}
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = seed.seed(**cls.seed_options)
+        cls.user = busiest_user(cls.data["users"])
+        cls.board = Board.objects.filter(owner=cls.user).order_by("pk").first()
+        cls.task = cls.board.tasks.order_by("pk").first()
+
+    def setUp(self):
+        reset_caches()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.user.auth_token.key}")
@@ -0,0 +1,14 @@
+from django.urls import path
+
+from core.async_api import reads_async
+from .async_views import board_detail, board_export, board_list
+from .streams import board_events
+
+urlpatterns = [
+    path('boards/', reads_async(board_list), name='board-list-async'),
+    path('boards/active/', reads_async(board_list), name='board-active-async'),
+    path('boards/<int:pk>/', reads_async(board_detail), name='board-detail-async'),
+    path('boards/<int:pk>/export/', reads_async(board_export), name='board-export-async'),
+    # Open-ended: a WSGI worker would buffer it forever, so it exists only here.
+    path('boards/<int:pk>/events/', board_events, name='board-events'),
+]
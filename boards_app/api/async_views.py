@@ -0,0 +1,58 @@
+from asgiref.sync import sync_to_async
+from django.http import StreamingHttpResponse
+from rest_framework.exceptions import NotFound
+
+from boards_app.list_cache import get_board_list
+from boards_app.models import Board
+from boards_app.transfer import aexport_board
+from boards_app.versioning import etag_matches, versions_etag
+from core.async_api import api_response, async_api_view, not_modified
+from .serializers import BoardDetailSerializer
+from .views import BoardViewSet, build_board_list, export_headers
+
+
+@async_api_view
+async def board_list(request):
+    generation, cached = get_board_list(request.user.pk)
+    if cached is None:
+        boards = Board.objects.visible_to(request.user).with_list_counts()
+        cached = await sync_to_async(build_board_list)(request, boards, generation)
+    etag, data = cached
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return api_response(data, headers={"ETag": etag})
+
+
+@async_api_view
+async def board_detail(request, pk):
+    version = await (
+        Board.objects.visible_to(request.user)
+        .filter(pk=pk)
+        .values_list("version", flat=True)
+        .afirst()
+    )
+    if version is None:
+        raise NotFound("No Board matches the given query.")
+    etag = versions_etag("board", pk, version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    cursor = await Board(pk=pk).changes.order_by("-pk").values_list("pk", flat=True).afirst()
+    board = await Board.objects.with_detail().aget(pk=pk)
+    return api_response(
+        BoardDetailSerializer(board).data,
+        headers={"ETag": etag, "X-Changes-Cursor": cursor or 0},
+    )
+
+
+@async_api_view
+async def board_export(request, pk):
+    # A sync generator would be drained into memory by the ASGI handler.
+    board = await Board.objects.visible_to(request.user).filter(pk=pk).afirst()
+    if board is None:
+        raise NotFound("No Board matches the given query.")
+    return StreamingHttpResponse(
+        aexport_board(board, chunk_size=BoardViewSet.export_chunk_size),
+        content_type="application/x-ndjson",
+        headers=export_headers(board),
+    )
@@ -1,9 +1,11 @@
 from rest_framework.permissions import BasePermission
 
+from boards_app.membership import has_board_access
+
 class IsBoardMemberOrOwner(BasePermission):
 
     def has_object_permission(self, request, view, obj):
-        return obj.owner == request.user or request.user in obj.members.all()
+        return obj.owner_id == request.user.id or has_board_access(request.user, obj.pk)
 
     def has_permission(self, request, view):
         return request.user and request.user.is_authenticated
@@ -11,4 +13,4 @@ class IsBoardMemberOrOwner(BasePermission):
 class IsBoardOwner(BasePermission):
 
     def has_object_permission(self, request, view, obj):
-        return obj.owner == request.user
\ No newline at end of file
+        return obj.owner_id == request.user.id
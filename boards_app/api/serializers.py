@@ -1,16 +1,17 @@
 from rest_framework import serializers
 from boards_app.models import Board
 from django.contrib.auth import get_user_model
-from tasks_app.api.serializers import TaskResponseSerializer
+from tasks_app.api.serializers import TaskResponseSerializer, CommentSerializer
+from user_auth_app.lookups import resolve_emails
 
 User = get_user_model()
 
 class BoardListSerializer(serializers.ModelSerializer):
-    member_count = serializers.SerializerMethodField()
-    ticket_count = serializers.SerializerMethodField()
-    tasks_to_do_count = serializers.SerializerMethodField()
-    tasks_high_prio_count = serializers.SerializerMethodField()
-    owner_id = serializers.ReadOnlyField(source='owner.id')
+    member_count = serializers.IntegerField(read_only=True)
+    ticket_count = serializers.IntegerField(read_only=True)
+    tasks_to_do_count = serializers.IntegerField(read_only=True)
+    tasks_high_prio_count = serializers.IntegerField(read_only=True)
+    owner_id = serializers.ReadOnlyField()
 
     class Meta:
         model = Board
@@ -24,33 +25,33 @@ class BoardListSerializer(serializers.ModelSerializer):
             'owner_id'
         ]
 
-    def get_member_count(self, obj):
-        return obj.members.count()
+class MemberEmailsMixin:
 
-    def get_ticket_count(self, obj):
-        return obj.tasks.count()
+    def validate_member_emails(self, value):
+        users, unknown = resolve_emails(value)
+        if unknown:
+            raise serializers.ValidationError(f"Unbekannte E-Mail-Adressen: {unknown}")
+        return users
 
-    def get_tasks_to_do_count(self, obj):
-        return obj.tasks.filter(status='to-do').count()
-
-    def get_tasks_high_prio_count(self, obj):
-        return obj.tasks.filter(priority='high').count()
-
-class BoardCreateSerializer(serializers.ModelSerializer):
+class BoardCreateSerializer(MemberEmailsMixin, serializers.ModelSerializer):
     members = serializers.ListField(
-        child=serializers.IntegerField(), write_only=True
+        child=serializers.IntegerField(), required=False, write_only=True
+    )
+    member_emails = serializers.ListField(
+        child=serializers.EmailField(), required=False, write_only=True, max_length=200
     )
 
     class Meta:
         model = Board
-        fields = ['title', 'members']
+        fields = ['title', 'members', 'member_emails']
 
     def create(self, validated_data):
         members = validated_data.pop("members", [])
+        member_users = validated_data.pop("member_emails", [])
         owner = self.context["request"].user
         board = Board.objects.create(owner=owner, **validated_data)
         users = User.objects.filter(id__in=members)
-        board.members.set(users)
+        board.members.set([*users, *member_users])
 
         return board
 
@@ -66,7 +67,7 @@ class UserSerializer(serializers.ModelSerializer):
 
 
 class BoardDetailSerializer(serializers.ModelSerializer):
-    owner_id = serializers.ReadOnlyField(source="owner.id")
+    owner_id = serializers.ReadOnlyField()
     members = UserSerializer(many=True, read_only=True)
     tasks = TaskResponseSerializer(many=True, read_only=True)
 
@@ -74,15 +75,18 @@ class BoardDetailSerializer(serializers.ModelSerializer):
         model = Board
         fields = ["id", "title", "owner_id", "members", "tasks"]
 
-class BoardUpdateSerializer(serializers.ModelSerializer):
+class BoardUpdateSerializer(MemberEmailsMixin, serializers.ModelSerializer):
     members = serializers.ListField(
         child=serializers.IntegerField(), required=False, write_only=True
     )
+    member_emails = serializers.ListField(
+        child=serializers.EmailField(), required=False, write_only=True, max_length=200
+    )
     title = serializers.CharField(required=False)
 
     class Meta:
         model = Board
-        fields = ["title", "members"]
+        fields = ["title", "members", "member_emails"]
 
     def validate_members(self, value):
         qs = User.objects.filter(id__in=value)
@@ -95,14 +99,15 @@ class BoardUpdateSerializer(serializers.ModelSerializer):
     
     def update(self, instance, validated_data):
         members = validated_data.pop("members", None)
+        member_users = validated_data.pop("member_emails", None)
         title = validated_data.get("title", None)
 
         if title is not None:
             instance.title = title
 
-        if members is not None:
-            users = User.objects.filter(id__in=members)
-            instance.members.set(users)
+        if members is not None or member_users is not None:
+            users = User.objects.filter(id__in=members or [])
+            instance.members.set([*users, *(member_users or [])])
 
         instance.save()
         return instance
@@ -113,4 +118,16 @@ class BoardUpdateResponseSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Board
-        fields = ["id", "title", "owner_data", "members_data"]
\ No newline at end of file
+        fields = ["id", "title", "owner_data", "members_data"]
+
+class CommentChangeSerializer(CommentSerializer):
+
+    class Meta(CommentSerializer.Meta):
+        fields = CommentSerializer.Meta.fields + ["task"]
+
+class BoardChangeSummarySerializer(serializers.ModelSerializer):
+    owner_id = serializers.ReadOnlyField()
+
+    class Meta:
+        model = Board
+        fields = ["id", "title", "owner_id"]
@@ -0,0 +1,46 @@
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
+
+from boards_app.events import hub
+from boards_app.membership import has_board_access
+from core.async_api import async_api_view
+
+
+@async_api_view(token_in_query=True)
+async def board_events(request, pk):
+    """Stream a board's task, comment and member changes as server-sent events.
+
+    Each event carries the change-feed cursor, so a client that was dropped
+    for falling behind picks up through /changes/?since=<cursor>. EventSource
+    cannot send headers, so the token may also come as ?token=.
+    """
+    if not await sync_to_async(has_board_access)(request.user, pk):
+        return JsonResponse({"detail": "Not found."}, status=404)
+
+    subscriber = hub.subscribe(pk)
+
+    async def stream():
+        try:
+            yield ": connected\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscriber.get(), settings.BOARD_EVENTS_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if event is None:
+                    yield "event: dropped\ndata: {}\n\n"
+                    break
+                yield f"id: {event['cursor']}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n"
+        finally:
+            hub.unsubscribe(pk, subscriber)
+
+    return StreamingHttpResponse(
+        stream(),
+        content_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,17 +1,31 @@
+from collections import defaultdict
+
 from rest_framework import viewsets, status, generics, mixins
+from rest_framework.decorators import action
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.exceptions import NotFound, PermissionDenied
 from django.contrib.auth import get_user_model
+from django.http import Http404, StreamingHttpResponse
+from django.utils import timezone
 
+from boards_app.list_cache import cache_board_list, get_board_list
 from boards_app.models import Board
+from boards_app.transfer import export_board
+from boards_app.versioning import etag_matches, not_modified, versions_etag
+from core.db_router import primary_reads
+from tasks_app.api.serializers import TaskResponseSerializer
+from tasks_app.models import Comment, Task
 from .serializers import (
     BoardListSerializer,
     BoardCreateSerializer,
     BoardDetailSerializer,
     BoardUpdateSerializer,
-    BoardUpdateResponseSerializer,  
+    BoardUpdateResponseSerializer,
+    BoardChangeSummarySerializer,
+    CommentChangeSerializer,
+    UserSerializer,
 )
 from .permissions import IsBoardMemberOrOwner, IsBoardOwner
 
@@ -22,24 +36,104 @@ class BoardViewSet(viewsets.ModelViewSet):
     queryset = Board.objects.all()
     permission_classes = [IsAuthenticated, IsBoardMemberOrOwner]
     lookup_field = "pk"
+    changes_page_size = 1000
+    export_chunk_size = 2000
 
     def get_serializer_class(self):
         if self.action == "list":
             return BoardListSerializer
         elif self.action == "create":
             return BoardCreateSerializer
-        elif self.action in ["retrieve", "update", "partial_update"]:
+        elif self.action in ["update", "partial_update"]:
             return BoardUpdateSerializer
         return BoardDetailSerializer
 
     def get_queryset(self):
-        user = self.request.user
-        return (Board.objects.filter(owner=user) | Board.objects.filter(members=user)).distinct()
+        boards = Board.objects.visible_to(self.request.user)
+        if self.action == "list":
+            return boards.with_list_counts()
+        if self.action == "retrieve":
+            return boards.with_detail()
+        return boards
+
+    def list(self, request, *args, **kwargs):
+        return board_list_response(request, self.get_queryset())
+
+    def retrieve(self, request, *args, **kwargs):
+        try:
+            pk = int(kwargs["pk"])
+        except ValueError:
+            raise Http404
+        version = (
+            Board.objects.visible_to(request.user)
+            .filter(pk=pk)
+            .values_list("version", flat=True)
+            .first()
+        )
+        if version is not None:
+            etag = versions_etag("board", pk, version)
+            response = not_modified(request, etag)
+            if response is None:
+                cursor = Board(pk=pk).changes.order_by("-pk").values_list("pk", flat=True).first()
+                response = super().retrieve(request, *args, **kwargs)
+                response["ETag"] = etag
+                response["X-Changes-Cursor"] = cursor or 0
+            return response
+        return super().retrieve(request, *args, **kwargs)
+
+    @action(detail=True, methods=["get"], url_path="changes")
+    def changes(self, request, pk=None):
+        board = self.get_object()
+        try:
+            since = int(request.query_params.get("since", 0))
+        except ValueError:
+            return Response({"detail": "Ungültiger Cursor."}, status=status.HTTP_400_BAD_REQUEST)
+
+        entries = list(
+            board.changes.filter(pk__gt=since).order_by("pk")
+            .values_list("pk", "kind", "object_id", "action")[:self.changes_page_size + 1]
+        )
+        has_more = len(entries) > self.changes_page_size
+        entries = entries[:self.changes_page_size]
+
+        latest = {}
+        for _, kind, object_id, change in entries:
+            latest[(kind, object_id)] = change
+        upserted, deleted = defaultdict(list), defaultdict(list)
+        for (kind, object_id), change in latest.items():
+            (upserted if change == "upsert" else deleted)[kind].append(object_id)
+
+        tasks = Task.objects.for_response().filter(board=board, pk__in=upserted["task"])
+        comments = Comment.objects.select_related("author").filter(task__board=board, pk__in=upserted["comment"])
+        members = board.members.filter(pk__in=upserted["member"])
+        return Response({
+            "cursor": entries[-1][0] if entries else since,
+            "has_more": has_more,
+            "board": BoardChangeSummarySerializer(board).data if upserted["board"] else None,
+            "members": UserSerializer(members, many=True).data if upserted["member"] else [],
+            "tasks": TaskResponseSerializer(tasks, many=True).data if upserted["task"] else [],
+            "comments": CommentChangeSerializer(comments, many=True).data if upserted["comment"] else [],
+            "deleted": {
+                "members": deleted["member"],
+                "tasks": deleted["task"],
+                "comments": deleted["comment"],
+            },
+        })
+
+    @action(detail=True, methods=["get"], url_path="export")
+    def export(self, request, pk=None):
+        board = self.get_object()
+        return StreamingHttpResponse(
+            export_board(board, chunk_size=self.export_chunk_size),
+            content_type="application/x-ndjson",
+            headers=export_headers(board),
+        )
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data, context={"request": request})
         serializer.is_valid(raise_exception=True)
-        board = serializer.save() 
+        board = serializer.save()
+        board = Board.objects.with_list_counts().get(pk=board.pk)
         return Response(BoardListSerializer(board).data, status=status.HTTP_201_CREATED)
 
     def update(self, request, *args, **kwargs):
@@ -56,32 +150,59 @@ class BoardViewSet(viewsets.ModelViewSet):
 
     def destroy(self, request, *args, **kwargs):
         board = self.get_object()
-        if board.owner != request.user:
+        if board.owner_id != request.user.id:
             return Response(
                 {"detail": "Nur der Eigentümer darf dieses Board löschen."},
                 status=status.HTTP_401_UNAUTHORIZED
             )
 
-        tasks = board.tasks.all()
-        for task in tasks:
-            task.comments.all().delete()
-            task.delete()
+        if request.query_params.get("deferred") in ("1", "true"):
+            board.deleted_at = timezone.now()
+            board.save(update_fields=["deleted_at"])
+            return Response(status=status.HTTP_202_ACCEPTED)
 
-        board.delete()
+        board.purge()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
+def export_headers(board):
+    return {"Content-Disposition": f'attachment; filename="board-{board.pk}.ndjson"'}
+
+
 class BoardActiveListView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        boards = Board.objects.filter(owner=request.user) | Board.objects.filter(members=request.user)
-        serializer = BoardListSerializer(boards.distinct(), many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        boards = Board.objects.visible_to(request.user).with_list_counts()
+        return board_list_response(request, boards)
+
+
+def board_list_response(request, boards):
+    generation, cached = get_board_list(request.user.pk)
+    etag, data = cached or build_board_list(request, boards, generation)
+    response = not_modified(request, etag)
+    if response is not None:
+        return response
+    return Response(data, status=status.HTTP_200_OK, headers={"ETag": etag})
+
+
+def build_board_list(request, boards, generation):
+    """Return ``(etag, data)`` for a list cache miss; data is None when the client's copy is current.
+
+    Reads the primary, the list is cached for everyone who asks next.
+    """
+    with primary_reads():
+        versions = list(boards.order_by("pk").values_list("pk", "version"))
+        etag = versions_etag("boards", request.user.pk, versions)
+        if etag_matches(request, etag):
+            return etag, None
+        data = BoardListSerializer(boards, many=True).data
+    cache_board_list(request.user.pk, generation, etag, data)
+    return etag, data
 
 
 class BoardDeactivateView(generics.GenericAPIView, mixins.UpdateModelMixin):
     permission_classes = [IsAuthenticated, IsBoardOwner]
-    queryset = Board.objects.all()
+    queryset = Board.objects.alive().with_detail()
     serializer_class = BoardDetailSerializer
 
     def post(self, request, pk):
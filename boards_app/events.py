@@ -0,0 +1,94 @@
+"""In-process pub/sub for live board events.
+
+Writes publish through ``hub`` after their transaction commits. The hub
+hands every event to its backend; the default ``LocalBackend`` delivers
+straight back to this process's subscribers. A broker-backed backend only
+has to implement ``publish`` and call ``hub.deliver`` for messages it
+receives, see ``BOARD_EVENTS_BACKEND``.
+"""
+import asyncio
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+class Subscriber:
+    """A bounded queue owned by one streaming response and its event loop."""
+
+    def __init__(self, maxsize):
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = False
+
+    def offer(self, event):
+        # Runs on the subscriber's loop. A consumer that cannot keep up is cut
+        # off rather than buffered without bound; it resyncs via the change feed.
+        if self.dropped:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.dropped = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+    async def get(self):
+        return await self.queue.get()
+
+
+class LocalBackend:
+
+    def __init__(self, hub):
+        self.hub = hub
+
+    def publish(self, board_id, event):
+        self.hub.deliver(board_id, event)
+
+
+class EventHub:
+
+    def __init__(self, backend_path, queue_size):
+        self.queue_size = queue_size
+        self.backend_path = backend_path
+        self._backend = None
+        self._subscribers = defaultdict(set)
+        self._lock = threading.Lock()
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            self._backend = import_string(self.backend_path)(self)
+        return self._backend
+
+    def subscribe(self, board_id):
+        subscriber = Subscriber(self.queue_size)
+        with self._lock:
+            self._subscribers[board_id].add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, board_id, subscriber):
+        with self._lock:
+            subscribers = self._subscribers.get(board_id)
+            if subscribers is not None:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self._subscribers[board_id]
+
+    def publish(self, board_id, event):
+        self.backend.publish(board_id, event)
+
+    def deliver(self, board_id, event):
+        """Fan an event out to this process's subscribers; safe from any thread."""
+        with self._lock:
+            subscribers = list(self._subscribers.get(board_id, ()))
+        for subscriber in subscribers:
+            try:
+                subscriber.loop.call_soon_threadsafe(subscriber.offer, event)
+            except RuntimeError:
+                self.unsubscribe(board_id, subscriber)
+
+
+hub = EventHub(settings.BOARD_EVENTS_BACKEND, settings.BOARD_EVENTS_QUEUE_SIZE)
@@ -0,0 +1,61 @@
+import time
+
+from django.core.cache import cache, caches
+from django.db import transaction
+
+# The cached lists live in their own, size-limited cache alias; the small
+# per-user generation counters stay in the default cache.
+list_cache = caches["board_lists"]
+
+
+def _generation_key(user_id):
+    return f"board-list-gen:{user_id}"
+
+
+def _generation(user_id):
+    key = _generation_key(user_id)
+    generation = cache.get(key)
+    if generation is None:
+        # Time based, so a counter that got evicted never restarts at a value
+        # an old entry was stored under.
+        cache.add(key, time.time_ns(), None)
+        generation = cache.get(key)
+    return generation
+
+
+def _list_key(user_id, generation):
+    return f"board-list:{user_id}:{generation}"
+
+
+def get_board_list(user_id):
+    """Return ``(generation, cached)`` where cached is the stored ``(etag, data)`` or None.
+
+    Store a freshly built list under the generation returned here, read
+    before building it, so a write racing the build is never cached as current.
+    """
+    generation = _generation(user_id)
+    return generation, list_cache.get(_list_key(user_id, generation))
+
+
+def cache_board_list(user_id, generation, etag, data):
+    list_cache.set(_list_key(user_id, generation), (etag, data))
+
+
+def forget_board_lists(user_ids):
+    """Move the users to a new generation now and again once the write commits.
+
+    Until then a concurrent request reads the old rows and may cache them
+    under the new generation; the second bump leaves that entry behind.
+    """
+    user_ids = set(user_ids)
+    _bump_generations(user_ids)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: _bump_generations(user_ids))
+
+
+def _bump_generations(user_ids):
+    for user_id in user_ids:
+        try:
+            cache.incr(_generation_key(user_id))
+        except ValueError:
+            pass
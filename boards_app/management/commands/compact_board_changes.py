@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from boards_app.models import BoardChange
+
+
+class Command(BaseCommand):
+    help = "Drop change feed entries that a later entry for the same object supersedes."
+
+    def handle(self, *args, **options):
+        removed = BoardChange.objects.compact()
+        self.stdout.write(self.style.SUCCESS(f"Removed {removed} superseded change(s)."))
@@ -0,0 +1,35 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from boards_app.models import Board
+from boards_app.transfer import export_board
+
+
+class Command(BaseCommand):
+    help = "Write a board with its members, tasks and comments as NDJSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument("board_id", type=int)
+        parser.add_argument("--output", "-o", help="File to write; stdout if omitted.")
+        parser.add_argument("--chunk-size", type=int, default=2000, help="Rows fetched per database round trip.")
+
+    def handle(self, *args, **options):
+        try:
+            board = Board.objects.get(pk=options["board_id"])
+        except Board.DoesNotExist:
+            raise CommandError(f"Board {options['board_id']} does not exist.")
+
+        start = time.perf_counter()
+        rows = 0
+        output = open(options["output"], "w", encoding="utf-8") if options["output"] else sys.stdout
+        try:
+            for line in export_board(board, chunk_size=options["chunk_size"]):
+                output.write(line)
+                rows += 1
+        finally:
+            if output is not sys.stdout:
+                output.close()
+        elapsed = time.perf_counter() - start
+        self.stderr.write(self.style.SUCCESS(f"Exported {rows} rows in {elapsed:.2f}s ({rows / elapsed:.0f} rows/s)."))
@@ -0,0 +1,36 @@
+import sys
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from boards_app.transfer import BoardImporter, BoardImportError
+from user_auth_app.lookups import get_user_by_email
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Create a board from an NDJSON export, remapping all ids."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Export file, or - for stdin.")
+        parser.add_argument("--owner", help="Email of the user who owns the imported board.")
+        parser.add_argument("--batch-size", type=int, default=1000, help="Rows per bulk INSERT.")
+
+    def handle(self, *args, **options):
+        owner = None
+        if options["owner"]:
+            try:
+                owner = get_user_by_email(options["owner"])
+            except User.DoesNotExist:
+                raise CommandError(f"No user with email {options['owner']}.")
+
+        source = sys.stdin if options["path"] == "-" else open(options["path"], encoding="utf-8")
+        try:
+            board, rows, rate = BoardImporter(source, owner=owner, batch_size=options["batch_size"]).run()
+        except BoardImportError as error:
+            raise CommandError(str(error))
+        finally:
+            if source is not sys.stdin:
+                source.close()
+        self.stdout.write(self.style.SUCCESS(f"Imported board {board.pk} with {rows} rows ({rate:.0f} rows/s)."))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from boards_app.models import Board
+
+
+class Command(BaseCommand):
+    help = "Purge boards that were marked deleted, in bounded chunks of tasks."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000, help="Tasks deleted per transaction.")
+
+    def handle(self, *args, **options):
+        purged = 0
+        for board in Board.objects.filter(deleted_at__isnull=False).order_by("deleted_at").iterator():
+            board.purge(chunk_size=options["chunk_size"])
+            purged += 1
+        self.stdout.write(self.style.SUCCESS(f"Purged {purged} board(s)."))
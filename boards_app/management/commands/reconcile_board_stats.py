@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from boards_app.models import BoardStats
+
+
+class Command(BaseCommand):
+    help = "Recount the denormalized per-board statistics and repair any drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument("board_ids", nargs="*", type=int, help="Only reconcile these boards.")
+
+    def handle(self, *args, **options):
+        drifted = BoardStats.objects.recount(options["board_ids"] or None)
+        self.stdout.write(self.style.SUCCESS(f"Reconciled board statistics, {drifted} board(s) had drifted."))
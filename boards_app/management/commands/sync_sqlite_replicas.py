@@ -0,0 +1,35 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class Command(BaseCommand):
+    help = "Copy the primary SQLite database onto every replica file in DB_REPLICA_PATHS."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--every", type=float, help="Keep copying every N seconds, simulating replication lag.")
+
+    def handle(self, *args, **options):
+        if not settings.DATABASE_REPLICAS:
+            raise CommandError("No replicas configured; set DB_REPLICA_PATHS.")
+        while True:
+            self.sync()
+            if not options["every"]:
+                break
+            time.sleep(options["every"])
+
+    def sync(self):
+        primary = connections[DEFAULT_DB_ALIAS]
+        primary.ensure_connection()
+        for alias in settings.DATABASE_REPLICAS:
+            connections[alias].close()
+            # The backup API copies a consistent snapshot even while the primary takes writes.
+            target = sqlite3.connect(settings.DATABASES[alias]["NAME"])
+            try:
+                primary.connection.backup(target)
+            finally:
+                target.close()
+            self.stdout.write(self.style.SUCCESS(f"Copied primary to {alias}."))
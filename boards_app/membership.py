@@ -0,0 +1,34 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+
+from core.db_router import primary_reads
+from .models import Board
+
+
+def _access_key(board_id, user_id):
+    return f"board-access:{board_id}:{user_id}"
+
+
+def has_board_access(user, board_id):
+    """Return whether ``user`` owns or is a member of the board, cached per (user, board)."""
+    key = _access_key(board_id, user.pk)
+    access = cache.get(key)
+    if access is None:
+        with primary_reads():
+            access = Board.objects.alive().filter(Q(owner=user) | Q(members=user), pk=board_id).exists()
+        cache.set(key, access, settings.BOARD_ACCESS_CACHE_TIMEOUT)
+    return access
+
+
+def forget_board_access(board_id, user_ids):
+    """Drop the cached answers now and again once the write commits.
+
+    Until then a concurrent request still reads the old membership and may
+    cache it; the second delete removes what it stored.
+    """
+    keys = [_access_key(board_id, user_id) for user_id in user_ids if user_id is not None]
+    cache.delete_many(keys)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: cache.delete_many(keys))
@@ -0,0 +1,64 @@
+# Generated by Django 5.2.5 on 2026-10-18 20:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+STATUS_FIELDS = {
+    'to-do': 'to_do_count',
+    'in-progress': 'in_progress_count',
+    'review': 'review_count',
+    'done': 'done_count',
+}
+PRIORITY_FIELDS = {
+    'low': 'low_priority_count',
+    'medium': 'medium_priority_count',
+    'high': 'high_priority_count',
+}
+
+
+def populate_board_stats(apps, schema_editor):
+    Board = apps.get_model('boards_app', 'Board')
+    BoardStats = apps.get_model('boards_app', 'BoardStats')
+    Task = apps.get_model('tasks_app', 'Task')
+
+    stats = {pk: BoardStats(board_id=pk) for pk in Board.objects.values_list('pk', flat=True)}
+    for row in Board.members.through.objects.values('board_id').annotate(count=Count('pk')):
+        stats[row['board_id']].member_count = row['count']
+    for row in Task.objects.values('board_id', 'status', 'priority').annotate(count=Count('pk')):
+        board_stats = stats[row['board_id']]
+        board_stats.task_count += row['count']
+        if row['status'] in STATUS_FIELDS:
+            field = STATUS_FIELDS[row['status']]
+            setattr(board_stats, field, getattr(board_stats, field) + row['count'])
+        if row['priority'] in PRIORITY_FIELDS:
+            field = PRIORITY_FIELDS[row['priority']]
+            setattr(board_stats, field, getattr(board_stats, field) + row['count'])
+    BoardStats.objects.bulk_create(stats.values(), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('boards_app', '0002_delete_task'),
+        ('tasks_app', '0004_alter_comment_author_alter_task_created_by_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BoardStats',
+            fields=[
+                ('board', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='boards_app.board')),
+                ('member_count', models.IntegerField(default=0)),
+                ('task_count', models.IntegerField(default=0)),
+                ('to_do_count', models.IntegerField(default=0)),
+                ('in_progress_count', models.IntegerField(default=0)),
+                ('review_count', models.IntegerField(default=0)),
+                ('done_count', models.IntegerField(default=0)),
+                ('low_priority_count', models.IntegerField(default=0)),
+                ('medium_priority_count', models.IntegerField(default=0)),
+                ('high_priority_count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(populate_board_stats, migrations.RunPython.noop),
+    ]
@@ -1,10 +1,288 @@
-from django.db import models
+from collections import Counter, defaultdict
+
+from django.db import models, transaction
+from django.db.models import Count, F, OuterRef, Prefetch, Q, Subquery
+from django.db.models.functions import Coalesce
 from django.contrib.auth.models import User
 
+
+class BoardQuerySet(models.QuerySet):
+
+    def alive(self):
+        return self.filter(deleted_at__isnull=True)
+
+    def deleted(self):
+        return self.filter(deleted_at__isnull=False)
+
+    def visible_to(self, user):
+        member_of = self.model.members.through.objects.filter(user=user).values("board_id")
+        return self.alive().filter(Q(owner=user) | Q(pk__in=member_of))
+
+    def with_list_counts(self):
+        return self.annotate(
+            member_count=Coalesce("stats__member_count", 0),
+            ticket_count=Coalesce("stats__task_count", 0),
+            tasks_to_do_count=Coalesce("stats__to_do_count", 0),
+            tasks_high_prio_count=Coalesce("stats__high_priority_count", 0),
+        )
+
+    def bump_version(self, board_ids, lists=True):
+        """Mark boards as changed; with ``lists`` also drop their users' cached board lists."""
+        from .list_cache import forget_board_lists
+
+        board_ids = {pk for pk in board_ids if pk is not None}
+        if board_ids:
+            self.filter(pk__in=board_ids).update(version=F("version") + 1)
+            if lists:
+                forget_board_lists(self.user_ids(board_ids))
+
+    def user_ids(self, board_ids):
+        owners = self.filter(pk__in=board_ids).values_list("owner_id", flat=True)
+        members = self.model.members.through.objects.filter(board_id__in=board_ids).values_list("user_id", flat=True)
+        return set(owners.union(members))
+
+    def with_detail(self):
+        from tasks_app.models import Task
+
+        return self.prefetch_related(
+            "members",
+            # Each column in card order, straight off task_column_rank_idx.
+            Prefetch("tasks", queryset=Task.objects.for_response().order_by("status", "rank", "id")),
+        )
+
+
 class Board(models.Model):
     title = models.CharField(max_length=255)
     owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name="owned_boards")
     members = models.ManyToManyField(User, related_name="member_boards", blank=True)
+    deleted_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    version = models.PositiveBigIntegerField(default=1)
+
+    objects = BoardQuerySet.as_manager()
 
     def __str__(self):
         return self.title
+
+    def save(self, *args, **kwargs):
+        # version only moves through F() updates (see bump_version); never
+        # write a possibly stale in-memory copy back.
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != "version"
+            ]
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_owner_id = instance.__dict__.get("owner_id")
+        instance._loaded_deleted_at = instance.__dict__.get("deleted_at")
+        return instance
+
+    def purge(self, chunk_size=None):
+        """Delete the board with set-based DELETEs, comments first, then tasks.
+
+        Without ``chunk_size`` everything happens in one transaction. With it,
+        every chunk of tasks is deleted in its own transaction so the write
+        lock is released in between.
+        """
+        from tasks_app.models import Task
+
+        from .list_cache import forget_board_lists
+        from .membership import forget_board_access
+
+        user_ids = Board.objects.user_ids([self.pk])
+        forget_board_lists(user_ids)
+        forget_board_access(self.pk, user_ids)
+        if not chunk_size:
+            with transaction.atomic():
+                self._delete_tasks(Task.objects.filter(board=self))
+                self.delete()
+            return
+
+        while True:
+            with transaction.atomic():
+                chunk = list(Task.objects.filter(board=self).values_list("pk", flat=True)[:chunk_size])
+                self._delete_tasks(Task.objects.filter(pk__in=chunk))
+            if len(chunk) < chunk_size:
+                break
+        with transaction.atomic():
+            self.delete()
+
+    def _delete_tasks(self, tasks):
+        # Nothing to announce per row, the tasks go away with the board.
+        tasks.delete_with_comments()
+
+
+class BoardStatsQuerySet(models.QuerySet):
+
+    def adjust(self, board_id, deltas):
+        changes = {field: F(field) + delta for field, delta in deltas.items() if delta}
+        if changes:
+            self.filter(board_id=board_id).update(**changes)
+
+    def apply_task_changes(self, changes):
+        deltas = defaultdict(Counter)
+        for previous, current in changes:
+            if previous == current:
+                continue
+            if previous is not None:
+                board_id, status, priority = previous
+                deltas[board_id].update(self.model.task_deltas(status, priority, -1))
+            if current is not None:
+                board_id, status, priority = current
+                deltas[board_id].update(self.model.task_deltas(status, priority, 1))
+        for board_id, board_deltas in deltas.items():
+            self.adjust(board_id, board_deltas)
+
+    def refresh_member_count(self, board_ids):
+        self.filter(board_id__in=board_ids).update(member_count=self.model.expected_counts()["member_count"])
+
+    def recount(self, board_ids=None):
+        boards = Board.objects.filter(stats__isnull=True)
+        if board_ids is not None:
+            boards = boards.filter(pk__in=board_ids)
+        self.bulk_create([self.model(board_id=pk) for pk in boards.values_list("pk", flat=True)])
+
+        stats = self.all() if board_ids is None else self.filter(board_id__in=board_ids)
+        expected = self.model.expected_counts()
+        drift = Q()
+        for field, expression in expected.items():
+            drift |= ~Q(**{field: expression})
+        return stats.filter(drift).update(**expected)
+
+
+class BoardStats(models.Model):
+    STATUS_FIELDS = {
+        "to-do": "to_do_count",
+        "in-progress": "in_progress_count",
+        "review": "review_count",
+        "done": "done_count",
+    }
+    PRIORITY_FIELDS = {
+        "low": "low_priority_count",
+        "medium": "medium_priority_count",
+        "high": "high_priority_count",
+    }
+
+    board = models.OneToOneField(Board, on_delete=models.CASCADE, primary_key=True, related_name="stats")
+    member_count = models.IntegerField(default=0)
+    task_count = models.IntegerField(default=0)
+    to_do_count = models.IntegerField(default=0)
+    in_progress_count = models.IntegerField(default=0)
+    review_count = models.IntegerField(default=0)
+    done_count = models.IntegerField(default=0)
+    low_priority_count = models.IntegerField(default=0)
+    medium_priority_count = models.IntegerField(default=0)
+    high_priority_count = models.IntegerField(default=0)
+
+    objects = BoardStatsQuerySet.as_manager()
+
+    def __str__(self):
+        return f"Stats for {self.board_id}"
+
+    @classmethod
+    def task_deltas(cls, status, priority, sign=1):
+        deltas = {"task_count": sign}
+        if status in cls.STATUS_FIELDS:
+            deltas[cls.STATUS_FIELDS[status]] = sign
+        if priority in cls.PRIORITY_FIELDS:
+            deltas[cls.PRIORITY_FIELDS[priority]] = sign
+        return deltas
+
+    @classmethod
+    def expected_counts(cls):
+        from tasks_app.models import Task
+
+        def count(queryset, key):
+            subquery = queryset.order_by().values(key).annotate(count=Count("pk")).values("count")
+            return Coalesce(Subquery(subquery), 0)
+
+        tasks = Task.objects.filter(board_id=OuterRef("board_id"))
+        counts = {
+            "member_count": count(Board.members.through.objects.filter(board_id=OuterRef("board_id")), "board_id"),
+            "task_count": count(tasks, "board_id"),
+        }
+        for status, field in cls.STATUS_FIELDS.items():
+            counts[field] = count(tasks.filter(status=status), "board_id")
+        for priority, field in cls.PRIORITY_FIELDS.items():
+            counts[field] = count(tasks.filter(priority=priority), "board_id")
+        return counts
+
+
+class BoardChangeQuerySet(models.QuerySet):
+
+    def record(self, board_id, kind, object_ids, action):
+        self.record_many([(board_id, kind, object_id, action) for object_id in object_ids])
+
+    def record_many(self, entries):
+        """Append ``(board_id, kind, object_id, action)`` entries in one INSERT
+        and announce them to live subscribers once the transaction commits."""
+        from .events import hub
+
+        changes = self.bulk_create([
+            self.model(board_id=board_id, kind=kind, object_id=object_id, action=action)
+            for board_id, kind, object_id, action in entries
+            if board_id is not None
+        ])
+
+        def announce():
+            for change in changes:
+                hub.publish(change.board_id, change.as_event())
+
+        if changes:
+            transaction.on_commit(announce)
+
+    def compact(self):
+        """Delete entries superseded by a later entry for the same object."""
+        latest = (
+            self.model.objects
+            .filter(board_id=OuterRef("board_id"), kind=OuterRef("kind"), object_id=OuterRef("object_id"))
+            .order_by("-pk")
+            .values("pk")[:1]
+        )
+        return self.exclude(pk=Subquery(latest)).delete()[0]
+
+
+class BoardChange(models.Model):
+    """Append-only change sequence per board; the primary key is the feed cursor."""
+    KIND_CHOICES = [
+        ("board", "Board"),
+        ("member", "Member"),
+        ("task", "Task"),
+        ("comment", "Comment"),
+    ]
+    ACTION_CHOICES = [
+        ("upsert", "Upsert"),
+        ("delete", "Delete"),
+    ]
+
+    # No database constraint: rows may be written while the board itself is
+    # being cascade-deleted; they are removed in the board's post_delete.
+    board = models.ForeignKey(
+        Board, on_delete=models.DO_NOTHING, db_constraint=False, db_index=False, related_name="changes"
+    )
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    action = models.CharField(max_length=20, choices=ACTION_CHOICES)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = BoardChangeQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["board", "id"], name="boardchange_board_seq_idx"),
+            models.Index(fields=["board", "kind", "object_id"], name="boardchange_object_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.action} {self.kind} {self.object_id} on board {self.board_id}"
+
+    def as_event(self):
+        return {
+            "type": f"{self.kind}.{self.action}",
+            "id": self.object_id,
+            "board": self.board_id,
+            "cursor": self.pk,
+        }
@@ -0,0 +1,58 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .list_cache import forget_board_lists
+from .membership import forget_board_access
+from .models import Board, BoardChange, BoardStats
+
+
+@receiver(post_save, sender=Board)
+def board_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        BoardStats.objects.create(board=instance)
+        forget_board_lists([instance.owner_id])
+    else:
+        if instance.deleted_at != getattr(instance, "_loaded_deleted_at", None):
+            # Deleted or restored: every member's cached answer is stale.
+            forget_board_access(instance.pk, Board.objects.user_ids([instance.pk]))
+        else:
+            forget_board_access(instance.pk, {instance.owner_id, getattr(instance, "_loaded_owner_id", None)})
+        Board.objects.bump_version([instance.pk])
+        BoardChange.objects.record(instance.pk, "board", [instance.pk], "upsert")
+    instance._loaded_owner_id = instance.owner_id
+    instance._loaded_deleted_at = instance.deleted_at
+
+
+@receiver(post_delete, sender=Board)
+def board_deleted(sender, instance, **kwargs):
+    BoardChange.objects.filter(board_id=instance.pk).delete()
+
+
+@receiver(m2m_changed, sender=Board.members.through)
+def membership_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == "pre_clear":
+        if reverse:
+            instance._cleared_pks = list(instance.member_boards.values_list("pk", flat=True))
+        else:
+            instance._cleared_pks = list(instance.members.values_list("pk", flat=True))
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if action == "post_clear":
+        pk_set = instance.__dict__.pop("_cleared_pks", [])
+    change = "upsert" if action == "post_add" else "delete"
+    if reverse:
+        board_ids = pk_set
+        for board_id in board_ids:
+            forget_board_access(board_id, [instance.pk])
+            BoardChange.objects.record(board_id, "member", [instance.pk], change)
+        forget_board_lists([instance.pk])
+    else:
+        board_ids = [instance.pk]
+        forget_board_access(instance.pk, pk_set)
+        forget_board_lists(pk_set)
+        BoardChange.objects.record(instance.pk, "member", pk_set, change)
+    BoardStats.objects.refresh_member_count(board_ids)
+    Board.objects.bump_version(board_ids)
@@ -1,3 +1,461 @@
-from django.test import TestCase
+import asyncio
+import json
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from benchmarks.testing import SeededAPITestCase, reset_caches
+from boards_app.api.views import BoardViewSet
+from boards_app.events import hub
+from boards_app.list_cache import cache_board_list, get_board_list
+from boards_app.membership import has_board_access
+from boards_app.models import Board, BoardChange, BoardStats
+from boards_app.transfer import FORMAT_VERSION, BoardImporter, BoardImportError, export_board, line
+from tasks_app.models import Comment, Task
+
+
+class BoardQueryBudgetTests(SeededAPITestCase):
+    """Query counts per board endpoint on cold caches.
+
+    The seeded user sees several boards with many tasks and comments, so a
+    per-row query (an N+1 in BoardListSerializer or in the nested task
+    serializers) blows the budget instead of hiding in a single row.
+    """
+
+    def test_list(self):
+        with self.assertNumQueries(3):
+            response = self.client.get("/api/boards/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), Board.objects.visible_to(self.user).count())
+
+    def test_list_served_from_cache(self):
+        self.client.get("/api/boards/")
+        with self.assertNumQueries(0):
+            response = self.client.get("/api/boards/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_list_not_modified(self):
+        etag = self.client.get("/api/boards/")["ETag"]
+        with self.assertNumQueries(0):
+            response = self.client.get("/api/boards/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_active_list(self):
+        with self.assertNumQueries(3):
+            response = self.client.get("/api/boards/active/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_create(self):
+        with self.assertNumQueries(5):
+            response = self.client.post("/api/boards/", {"title": "Neu"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_list_filled_before_commit(self):
+        member = self.board.members.exclude(pk=self.user.pk).first()
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                self.board.members.remove(member)
+                # A concurrent request that still reads the membership caches its list.
+                generation, _ = get_board_list(member.pk)
+                cache_board_list(member.pk, generation, '"stale"', [])
+        self.assertIsNone(get_board_list(member.pk)[1])
+
+    def test_detail(self):
+        with self.assertNumQueries(6):
+            response = self.client.get(f"/api/boards/{self.board.pk}/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["tasks"]), self.board.tasks.count())
+
+    def test_detail_non_numeric_pk(self):
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/boards/abc/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_detail_not_modified(self):
+        etag = self.client.get(f"/api/boards/{self.board.pk}/")["ETag"]
+        with self.assertNumQueries(1):
+            response = self.client.get(f"/api/boards/{self.board.pk}/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_update(self):
+        with self.assertNumQueries(8):
+            response = self.client.patch(f"/api/boards/{self.board.pk}/", {"title": "Umbenannt"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_changes(self):
+        self.client.patch(f"/api/boards/{self.board.pk}/", {"title": "Umbenannt"}, format="json")
+        reset_caches()
+        with self.assertNumQueries(3):
+            response = self.client.get(f"/api/boards/{self.board.pk}/changes/?since=0")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["board"]["title"], "Umbenannt")
+
+    def test_deactivate(self):
+        with self.assertNumQueries(8):
+            response = self.client.post(f"/api/boards/{self.board.pk}/deactivate/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_delete(self):
+        with self.assertNumQueries(13):
+            response = self.client.delete(f"/api/boards/{self.board.pk}/")
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Board.objects.filter(pk=self.board.pk).exists())
+
+    def test_list_queries_do_not_grow_with_boards(self):
+        with CaptureQueriesContext(connection) as before:
+            self.client.get("/api/boards/")
+        for board in Board.objects.exclude(members=self.user).exclude(owner=self.user):
+            board.members.add(self.user)
+        self.client.get("/api/boards/")  # the membership changes dropped the cached list
+        with CaptureQueriesContext(connection) as after:
+            self.client.get("/api/boards/")
+        self.assertLessEqual(len(after.captured_queries), len(before.captured_queries))
+
+
+class BoardMemberEmailTests(SeededAPITestCase):
+    """Members given by email on create and update, resolved with one query for all addresses."""
+
+    def setUp(self):
+        super().setUp()
+        self.others = [user for user in self.data["users"] if user.pk != self.user.pk][:3]
+        self.emails = [user.email.upper() if i % 2 else user.email for i, user in enumerate(self.others)]
+
+    def test_create(self):
+        with self.assertNumQueries(12):
+            response = self.client.post("/api/boards/", {"title": "Neu", "member_emails": self.emails}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        board = Board.objects.get(pk=response.data["id"])
+        self.assertEqual(set(board.members.values_list("pk", flat=True)), {user.pk for user in self.others})
+        self.assertEqual(response.data["member_count"], len(self.others))
+
+    def test_create_unknown_email(self):
+        boards = Board.objects.count()
+        with self.assertNumQueries(2):
+            response = self.client.post(
+                "/api/boards/", {"title": "Neu", "member_emails": [*self.emails, "Niemand@Example.com"]}, format="json"
+            )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("Niemand@Example.com", str(response.data["member_emails"]))
+        self.assertEqual(Board.objects.count(), boards)
+
+    def test_update(self):
+        # Removal and addition each record, recount and bump once for all members.
+        with self.assertNumQueries(21):
+            response = self.client.patch(
+                f"/api/boards/{self.board.pk}/", {"member_emails": self.emails}, format="json"
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(self.board.members.values_list("pk", flat=True)), {user.pk for user in self.others})
+
+    def test_update_unknown_email(self):
+        members = set(self.board.members.values_list("pk", flat=True))
+        with self.assertNumQueries(3):
+            response = self.client.patch(
+                f"/api/boards/{self.board.pk}/", {"member_emails": ["niemand@example.com"]}, format="json"
+            )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(set(self.board.members.values_list("pk", flat=True)), members)
+
+
+class BoardStatsTests(SeededAPITestCase):
+    """BoardStats follow task and member writes; recount repairs drift."""
+
+    def stats(self):
+        return BoardStats.objects.get(board=self.board)
+
+    def assertStatsCurrent(self):
+        self.assertEqual(BoardStats.objects.recount([self.board.pk]), 0)
+
+    def test_task_writes(self):
+        before = self.stats()
+        response = self.client.post(
+            "/api/tasks/", {"board": self.board.pk, "title": "Neu", "status": "done", "priority": "high"}, format="json"
+        )
+        stats = self.stats()
+        self.assertEqual(stats.task_count, before.task_count + 1)
+        self.assertEqual(stats.done_count, before.done_count + 1)
+        self.assertEqual(stats.high_priority_count, before.high_priority_count + 1)
+        self.assertStatsCurrent()
+
+        self.client.patch(f"/api/tasks/{response.data['id']}/", {"status": "review", "priority": "low"}, format="json")
+        stats = self.stats()
+        self.assertEqual((stats.done_count, stats.review_count), (before.done_count, before.review_count + 1))
+        self.assertStatsCurrent()
+
+        self.client.delete(f"/api/tasks/{response.data['id']}/")
+        self.assertEqual(self.stats().task_count, before.task_count)
+        self.assertStatsCurrent()
+
+    def test_member_changes(self):
+        outsider = next(user for user in self.data["users"] if not self.board.members.filter(pk=user.pk).exists())
+        self.board.members.add(outsider)
+        self.assertEqual(self.stats().member_count, self.board.members.count())
+        self.board.members.clear()
+        self.assertEqual(self.stats().member_count, 0)
+        self.assertStatsCurrent()
+
+    def test_recount_repairs_drift(self):
+        BoardStats.objects.filter(board=self.board).update(task_count=0, done_count=99)
+        self.assertEqual(BoardStats.objects.recount([self.board.pk]), 1)
+        stats = self.stats()
+        self.assertEqual(stats.task_count, self.board.tasks.count())
+        self.assertEqual(stats.done_count, self.board.tasks.filter(status="done").count())
+
+    def test_recount_creates_missing_stats(self):
+        BoardStats.objects.filter(board=self.board).delete()
+        BoardStats.objects.recount([self.board.pk])
+        self.assertEqual(self.stats().task_count, Task.objects.filter(board=self.board).count())
+
+
+class BoardAccessCacheTests(SeededAPITestCase):
+    """Cached membership answers are dropped as soon as access is granted or revoked."""
+
+    def setUp(self):
+        super().setUp()
+        self.members = list(self.board.members.exclude(pk=self.user.pk))
+
+    def test_member_removal(self):
+        member = self.members[0]
+        self.assertTrue(has_board_access(member, self.board.pk))
+        self.board.members.remove(member)
+        self.assertFalse(has_board_access(member, self.board.pk))
+
+    def test_member_added(self):
+        outsider = next(user for user in self.data["users"] if user.pk not in Board.objects.user_ids([self.board.pk]))
+        self.assertFalse(has_board_access(outsider, self.board.pk))
+        self.board.members.add(outsider)
+        self.assertTrue(has_board_access(outsider, self.board.pk))
+
+    def test_owner_change(self):
+        self.board.members.remove(self.user)
+        self.assertTrue(has_board_access(self.user, self.board.pk))
+        board = Board.objects.get(pk=self.board.pk)
+        board.owner = self.members[0]
+        board.save()
+        self.assertFalse(has_board_access(self.user, self.board.pk))
+
+    def test_soft_delete(self):
+        for member in self.members:
+            self.assertTrue(has_board_access(member, self.board.pk))
+        response = self.client.delete(f"/api/boards/{self.board.pk}/?deferred=true")
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        for member in self.members:
+            self.assertFalse(has_board_access(member, self.board.pk))
+
+    def test_stale_fill_before_commit(self):
+        member = self.members[0]
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                self.board.members.remove(member)
+                # A concurrent request that still sees the membership caches it.
+                cache.set(f"board-access:{self.board.pk}:{member.pk}", True)
+        self.assertFalse(has_board_access(member, self.board.pk))
+
+
+class BoardChangeFeedTests(SeededAPITestCase):
+    """Change feed entries, tombstones for deletions and compaction."""
+
+    def cursor(self):
+        return self.board.changes.order_by("-pk").values_list("pk", flat=True).first() or 0
+
+    def changes(self, since):
+        response = self.client.get(f"/api/boards/{self.board.pk}/changes/", {"since": since})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_tombstones(self):
+        since = self.cursor()
+        task = self.board.tasks.order_by("pk").last()
+        comment = Comment.objects.create(task=self.task, author=self.user, content="Weg")
+        comment_id = comment.pk
+        comment.delete()
+        member = self.board.members.exclude(pk=self.user.pk).first()
+        self.board.members.remove(member)
+        self.client.delete(f"/api/tasks/{task.pk}/")
+
+        data = self.changes(since)
+        self.assertEqual(data["deleted"], {"members": [member.pk], "tasks": [task.pk], "comments": [comment_id]})
+        # A comment created and deleted after the cursor only shows up as deleted.
+        self.assertEqual(data["comments"], [])
+        self.assertEqual(self.changes(data["cursor"])["deleted"], {"members": [], "tasks": [], "comments": []})
+
+    def test_task_moved_to_other_board(self):
+        other = Board.objects.visible_to(self.user).exclude(pk=self.board.pk).first()
+        since = self.cursor()
+        task = Task.objects.get(pk=self.task.pk)
+        task.board = other
+        task.save()
+        self.assertEqual(self.changes(since)["deleted"]["tasks"], [task.pk])
+
+    def test_upsert_then_delete_collapses(self):
+        since = self.cursor()
+        response = self.client.post("/api/tasks/", {"board": self.board.pk, "title": "Kurz"}, format="json")
+        self.client.delete(f"/api/tasks/{response.data['id']}/")
+        data = self.changes(since)
+        self.assertEqual(data["tasks"], [])
+        self.assertEqual(data["deleted"]["tasks"], [response.data["id"]])
+
+    def test_compact_keeps_latest_entry_per_object(self):
+        for title in ["Eins", "Zwei", "Drei"]:
+            self.client.patch(f"/api/tasks/{self.task.pk}/", {"title": title}, format="json")
+        entries = BoardChange.objects.filter(board=self.board, kind="task", object_id=self.task.pk)
+        latest = entries.order_by("-pk").first()
+        self.assertGreater(entries.count(), 1)
+
+        self.assertGreater(BoardChange.objects.compact(), 0)
+        self.assertEqual(list(entries), [latest])
+        self.assertEqual(BoardChange.objects.compact(), 0)
+        # Replaying the compacted feed from the start still ends in the same state.
+        data = self.changes(0)
+        self.assertIn(self.task.pk, [task["id"] for task in data["tasks"]])
+        self.assertEqual(data["cursor"], self.cursor())
+
+
+class BoardEventTests(SeededAPITestCase):
+    """Live events go out only after their transaction commits and reach SSE subscribers."""
+
+    def create_comment(self, content="Live"):
+        return self.client.post(f"/api/tasks/{self.task.pk}/comments/", {"content": content}, format="json")
+
+    def test_published_on_commit(self):
+        with mock.patch.object(hub, "publish") as publish:
+            with self.captureOnCommitCallbacks() as callbacks:
+                response = self.create_comment()
+                publish.assert_not_called()
+            for callback in callbacks:
+                callback()
+        cursor = self.board.changes.order_by("-pk").values_list("pk", flat=True).first()
+        publish.assert_any_call(
+            self.board.pk, {"type": "comment.upsert", "id": response.data["id"], "board": self.board.pk, "cursor": cursor}
+        )
+
+    def test_rolled_back_write_publishes_nothing(self):
+        with mock.patch.object(hub, "publish") as publish:
+            with self.captureOnCommitCallbacks(execute=True):
+                with self.assertRaises(RuntimeError):
+                    with transaction.atomic():
+                        Comment.objects.create(task=self.task, author=self.user, content="Verworfen")
+                        raise RuntimeError
+        publish.assert_not_called()
+
+    async def read_event(self, stream):
+        chunk = await asyncio.wait_for(anext(stream), 2)
+        return chunk.decode() if isinstance(chunk, bytes) else chunk
+
+    def test_sse_not_routed_under_wsgi(self):
+        response = self.client.get(f"/api/boards/{self.board.pk}/events/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_sse_delivery(self):
+        response = await self.async_client.get(
+            f"/api/boards/{self.board.pk}/events/", {"token": self.user.auth_token.key}
+        )
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        stream = aiter(response.streaming_content)
+        self.assertEqual(await self.read_event(stream), ": connected\n\n")
+
+        def write():
+            with self.captureOnCommitCallbacks(execute=True):
+                return self.create_comment("Per SSE")
+
+        comment = await sync_to_async(write)()
+        lines = dict(line.split(": ", 1) for line in (await self.read_event(stream)).strip().split("\n"))
+        self.assertEqual(lines["event"], "comment.upsert")
+        self.assertEqual(json.loads(lines["data"])["id"], comment.data["id"])
+        await stream.aclose()
+
+    async def test_sse_requires_board_access(self):
+        outsider = await Board.objects.exclude(members=self.user).exclude(owner=self.user).afirst()
+        response = await self.async_client.get(
+            f"/api/boards/{outsider.pk}/events/", {"token": self.user.auth_token.key}
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_slow_subscriber_is_dropped(self):
+        with mock.patch.object(hub, "queue_size", 2):
+            subscriber = hub.subscribe(self.board.pk)
+        try:
+            for cursor in range(3):
+                hub.deliver(self.board.pk, {"type": "task.upsert", "id": 1, "board": self.board.pk, "cursor": cursor})
+            await asyncio.sleep(0)
+            self.assertTrue(subscriber.dropped)
+            self.assertIsNone(await subscriber.get())
+        finally:
+            hub.unsubscribe(self.board.pk, subscriber)
+
+
+class BoardTransferTests(SeededAPITestCase):
+    """An export imports back into an equal board, in batches and in one transaction."""
+    task_fields = ["title", "description", "status", "priority", "due_date", "rank", "created_at", "updated_at"]
+
+    def snapshot(self, board):
+        tasks = list(board.tasks.order_by("created_at", "pk").values_list(*self.task_fields))
+        comments = list(
+            Comment.objects.filter(task__board=board).order_by("created_at", "pk")
+            .values_list("task__title", "author__email", "content", "created_at")
+        )
+        members = set(board.members.values_list("email", flat=True))
+        return tasks, comments, members
+
+    def test_round_trip(self):
+        lines = list(export_board(self.board, chunk_size=4))
+        imported, rows, _ = BoardImporter(iter(lines), owner=self.user, batch_size=4).run()
+
+        self.assertEqual(rows, len(lines))
+        self.assertEqual(imported.title, self.board.title)
+        self.assertEqual(self.snapshot(imported), self.snapshot(self.board))
+        stats = BoardStats.objects.get(board=imported)
+        self.assertEqual(stats.task_count, self.board.tasks.count())
+        self.assertEqual(
+            sorted(imported.tasks.values_list("comments_count", flat=True)),
+            sorted(self.board.tasks.values_list("comments_count", flat=True)),
+        )
+
+    def test_colliding_usernames(self):
+        User.objects.create_user("Taken", "taken@example.com")
+        User.objects.create_user("Taken-92", "taken92@example.com")
+        exported = [(90, "Same Name"), (91, "Same Name"), (92, "Taken"), (93, "Same Name-91")]
+        lines = [
+            line({"type": "export", "version": FORMAT_VERSION}),
+            *(line({"type": "user", "id": pk, "username": name, "email": f"neu{pk}@example.com"}) for pk, name in exported),
+            line({"type": "board", "id": 1, "title": "Import", "owner_id": 90}),
+            *(line({"type": "member", "user_id": pk}) for pk, _ in exported),
+        ]
+        board, _, _ = BoardImporter(iter(lines)).run()
+        self.assertEqual(
+            dict(board.members.values_list("email", "username")),
+            {
+                "neu90@example.com": "Same Name",
+                "neu91@example.com": "Same Name-91",
+                "neu92@example.com": "Taken-92-2",
+                "neu93@example.com": "Same Name-91-93",
+            },
+        )
+
+    def test_malformed_line_rolls_back(self):
+        lines = list(export_board(self.board))
+        # Past the first task batches, so rows were already written.
+        position = next(i for i, text in enumerate(lines) if '"type": "comment"' in text)
+        lines.insert(position, '{"type": "task", "title": \n')
+        counts = Board.objects.count(), Task.objects.count(), Comment.objects.count()
+
+        with self.assertRaisesMessage(BoardImportError, f"Zeile {position + 1}: kein gültiges JSON."):
+            BoardImporter(iter(lines), owner=self.user, batch_size=4).run()
+        self.assertEqual((Board.objects.count(), Task.objects.count(), Comment.objects.count()), counts)
+
+    async def test_streams_under_asgi(self):
+        expected = await sync_to_async(lambda: "".join(export_board(self.board)))()
+        with mock.patch.object(BoardViewSet, "export_chunk_size", 10):
+            response = await self.async_client.get(
+                f"/api/boards/{self.board.pk}/export/", headers={"Authorization": f"Token {self.user.auth_token.key}"}
+            )
+            self.assertTrue(response.is_async)
+            chunks = [chunk async for chunk in response.streaming_content]
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(b"".join(chunks).decode(), expected)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
@@ -0,0 +1,297 @@
+"""Board export and import as newline-delimited JSON.
+
+An export is one JSON object per line, in dependency order: a header, the
+users it references, the board, its members, tasks and comments. Rows are
+read with ``iterator(chunk_size)`` so memory stays flat however big the board
+is; ``aexport_board`` serves the same lines to async responses.
+
+Imports read the stream line by line and remap every id. Tasks and comments
+are written in batches by ``insert_as_is``, which keeps their exported
+timestamps. Users are matched by email; the target's missing accounts are
+created (without a usable password) under a free username.
+"""
+import datetime
+import itertools
+import json
+import time
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.db import connections, router, transaction
+from django.db.models import Q
+from django.utils.dateparse import parse_date, parse_datetime
+
+from boards_app.list_cache import forget_board_lists
+from boards_app.models import Board, BoardStats
+from tasks_app.models import Comment, Task
+from user_auth_app.lookups import normalize_email, resolve_emails
+
+User = get_user_model()
+
+FORMAT_VERSION = 1
+TASK_FIELDS = [
+    "id", "title", "description", "status", "priority", "due_date",
+    "assignee_id", "reviewer_id", "created_by_id", "rank", "created_at", "updated_at",
+]
+COMMENT_FIELDS = ["id", "task_id", "author_id", "content", "created_at"]
+
+
+class BoardImportError(ValueError):
+    pass
+
+
+def export_board(board, chunk_size=2000):
+    """Yield the board as NDJSON lines."""
+    tasks = Task.objects.filter(board=board)
+    comments = Comment.objects.filter(task__board=board)
+    users = User.objects.filter(
+        Q(pk=board.owner_id)
+        | Q(member_boards=board)
+        | Q(pk__in=tasks.values("assignee_id"))
+        | Q(pk__in=tasks.values("reviewer_id"))
+        | Q(pk__in=tasks.values("created_by_id"))
+        | Q(pk__in=comments.values("author_id"))
+    ).order_by("pk")
+
+    yield line({"type": "export", "version": FORMAT_VERSION})
+    for user in users.values("id", "username", "email").iterator(chunk_size=chunk_size):
+        yield line({"type": "user", **user})
+    yield line({"type": "board", "id": board.pk, "title": board.title, "owner_id": board.owner_id})
+    for user_id in board.members.through.objects.filter(board=board).values_list("user_id", flat=True):
+        yield line({"type": "member", "user_id": user_id})
+    for task in tasks.order_by("pk").values(*TASK_FIELDS).iterator(chunk_size=chunk_size):
+        yield line({"type": "task", **task})
+    for comment in comments.order_by("pk").values(*COMMENT_FIELDS).iterator(chunk_size=chunk_size):
+        yield line({"type": "comment", **comment})
+
+
+async def aexport_board(board, chunk_size=2000):
+    """Async iterator over ``export_board``, for responses served under ASGI.
+
+    The rows are read in the request's worker thread, ``chunk_size`` lines per
+    hop, and each hop is sent as one chunk.
+    """
+    lines = export_board(board, chunk_size=chunk_size)
+    next_chunk = sync_to_async(lambda: "".join(itertools.islice(lines, chunk_size)))
+    try:
+        while chunk := await next_chunk():
+            yield chunk
+    finally:
+        await sync_to_async(lines.close)()
+
+
+def line(record):
+    return json.dumps(record, default=encode_value) + "\n"
+
+
+def encode_value(value):
+    # Full microseconds; DjangoJSONEncoder would cut datetimes to milliseconds.
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+class BoardImporter:
+    """Recreate an exported board from an iterable of NDJSON lines.
+
+    The whole import is one transaction. ``owner`` replaces the exported owner.
+    """
+
+    def __init__(self, lines, owner=None, batch_size=1000):
+        self.lines = lines
+        self.owner = owner
+        self.batch_size = batch_size
+        self.users = {}
+        self.tasks = {}
+        self.pending_users = []
+        self.pending_members = []
+        self.pending_tasks = []
+        self.pending_comments = []
+        self.board = None
+        self.rows = 0
+
+    def run(self):
+        """Import everything and return ``(board, rows, rows per second)``."""
+        start = time.perf_counter()
+        with transaction.atomic():
+            for number, text in enumerate(self.lines, start=1):
+                if text.strip():
+                    self.handle(self.parse(text, number), number)
+            if self.board is None:
+                raise BoardImportError("Export enthält kein Board.")
+            self.flush_members()
+            self.flush_tasks()
+            self.flush_comments()
+            BoardStats.objects.recount([self.board.pk])
+            Task.objects.recount_comments([self.board.pk])
+        forget_board_lists(Board.objects.user_ids([self.board.pk]))
+        elapsed = time.perf_counter() - start
+        return self.board, self.rows, self.rows / elapsed if elapsed else 0.0
+
+    def parse(self, text, number):
+        try:
+            record = json.loads(text)
+        except ValueError:
+            raise BoardImportError(f"Zeile {number}: kein gültiges JSON.")
+        if not isinstance(record, dict) or "type" not in record:
+            raise BoardImportError(f"Zeile {number}: Datensatz ohne Typ.")
+        return record
+
+    def handle(self, record, number):
+        kind = record.pop("type")
+        if kind == "export":
+            if record.get("version") != FORMAT_VERSION:
+                raise BoardImportError(f"Nicht unterstützte Exportversion {record.get('version')}.")
+        elif kind == "user":
+            self.pending_users.append(record)
+        elif kind == "board":
+            self.create_board(record)
+        elif kind == "member":
+            self.require_board(number)
+            self.pending_members.append(self.user_id(record["user_id"]))
+        elif kind == "task":
+            self.require_board(number)
+            self.pending_tasks.append(record)
+            if len(self.pending_tasks) >= self.batch_size:
+                self.flush_tasks()
+        elif kind == "comment":
+            self.pending_comments.append(record)
+            if len(self.pending_comments) >= self.batch_size:
+                self.flush_tasks()
+                self.flush_comments()
+        else:
+            raise BoardImportError(f"Zeile {number}: unbekannter Typ {kind!r}.")
+        self.rows += 1
+
+    def require_board(self, number):
+        if self.board is None:
+            raise BoardImportError(f"Zeile {number}: Datensatz vor dem Board.")
+
+    def user_id(self, old_id):
+        if old_id is None:
+            return None
+        if self.pending_users:
+            self.flush_users()
+        try:
+            return self.users[old_id]
+        except KeyError:
+            raise BoardImportError(f"Unbekannter Benutzer {old_id} im Export.")
+
+    def flush_users(self):
+        records, self.pending_users = self.pending_users, []
+        found, _ = resolve_emails([record["email"] for record in records if record["email"]])
+        by_email = {normalize_email(user.email): user.pk for user in found}
+        candidates = [name for record in records for name in (record["username"], suffixed_username(record))]
+        taken = set(User.objects.filter(username__in=candidates).values_list("username", flat=True))
+        missing = []
+        for record in records:
+            pk = by_email.get(normalize_email(record["email"])) if record["email"] else None
+            if pk is not None:
+                self.users[record["id"]] = pk
+                continue
+            username = free_username(record, taken)
+            taken.add(username)
+            user = User(username=username, email=record["email"])
+            user.set_unusable_password()
+            missing.append((record["id"], user))
+        for old_id, user in zip([old for old, _ in missing], User.objects.bulk_create([user for _, user in missing])):
+            self.users[old_id] = user.pk
+
+    def create_board(self, record):
+        owner_id = self.owner.pk if self.owner else self.user_id(record["owner_id"])
+        self.board = Board.objects.create(title=record["title"], owner_id=owner_id)
+
+    def flush_members(self):
+        user_ids, self.pending_members = self.pending_members, []
+        Membership = Board.members.through
+        Membership.objects.bulk_create(
+            [Membership(board=self.board, user_id=user_id) for user_id in user_ids], ignore_conflicts=True
+        )
+
+    def flush_tasks(self):
+        self.flush_members()
+        records, self.pending_tasks = self.pending_tasks, []
+        if not records:
+            return
+        tasks = [
+            Task(
+                board=self.board,
+                title=record["title"],
+                description=record["description"],
+                status=record["status"],
+                priority=record["priority"],
+                due_date=parse_date(record["due_date"]) if record["due_date"] else None,
+                assignee_id=self.user_id(record["assignee_id"]),
+                reviewer_id=self.user_id(record["reviewer_id"]),
+                created_by_id=self.user_id(record["created_by_id"]),
+                rank=record.get("rank", ""),
+                created_at=parse_datetime(record["created_at"]),
+                updated_at=parse_datetime(record["updated_at"]),
+            )
+            for record in records
+        ]
+        # Exports from before card ranking: append in export order.
+        unranked = [task for task in tasks if not task.rank]
+        if unranked:
+            Task.objects.place_last(unranked)
+        insert_as_is(Task, tasks)
+        for record, task in zip(records, tasks):
+            self.tasks[record["id"]] = task.pk
+
+    def flush_comments(self):
+        records, self.pending_comments = self.pending_comments, []
+        if not records:
+            return
+        try:
+            comments = [
+                Comment(task_id=self.tasks[record["task_id"]], author_id=self.user_id(record["author_id"]),
+                        content=record["content"], created_at=parse_datetime(record["created_at"]))
+                for record in records
+            ]
+        except KeyError as error:
+            raise BoardImportError(f"Kommentar zu unbekannter Aufgabe {error.args[0]}.")
+        insert_as_is(Comment, comments)
+
+
+def suffixed_username(record, *suffixes):
+    suffix = "".join(f"-{part}" for part in (record["id"], *suffixes))
+    return record["username"][:User._meta.get_field("username").max_length - len(suffix)] + suffix
+
+
+def free_username(record, taken):
+    """The exported username, else ``<username>-<exported id>``, else that with
+    a counter. ``taken`` holds the names in use, checked for the first two."""
+    if record["username"] not in taken:
+        return record["username"]
+    username = suffixed_username(record)
+    counter = 1
+    while username in taken or (counter > 1 and User.objects.filter(username=username).exists()):
+        counter += 1
+        username = suffixed_username(record, counter)
+    return username
+
+
+def insert_as_is(model, objects):
+    """``bulk_create`` without ``pre_save``, so auto_now/auto_now_add fields
+    keep the exported timestamps, and with primary keys set on ``objects``.
+
+    ``bulk_create`` has no way to skip ``pre_save``, which stamps those
+    fields with the current time; keeping them through it would take a second
+    ``bulk_update`` pass over every row. This goes one level down to
+    ``QuerySet._insert(raw=True)``, the path ``loaddata`` takes through
+    ``save_base(raw=True)``. Like ``bulk_create`` it sends no signals: the
+    importer recounts stats and comment counts once at the end. The
+    round-trip test in boards_app.tests pins the timestamps.
+    """
+    fields = [field for field in model._meta.concrete_fields if not field.primary_key]
+    using = router.db_for_write(model)
+    batch_size = connections[using].ops.bulk_batch_size(fields, objects)
+    for start in range(0, len(objects), batch_size):
+        batch = objects[start:start + batch_size]
+        rows = model.objects.using(using)._insert(
+            batch, fields=fields, returning_fields=model._meta.db_returning_fields, raw=True, using=using
+        )
+        for obj, (pk,) in zip(batch, rows):
+            obj.pk = pk
+            obj._state.adding = False
+            obj._state.db = using
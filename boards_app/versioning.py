@@ -0,0 +1,23 @@
+import hashlib
+
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def versions_etag(*parts):
+    """Build a strong ETag from board versions and whatever else shapes the response."""
+    return quote_etag(hashlib.sha1(repr(parts).encode()).hexdigest())
+
+
+def etag_matches(request, etag):
+    """Whether the client's If-None-Match already covers ``etag``."""
+    if_none_match = request.headers.get("If-None-Match")
+    return bool(if_none_match) and (etag in parse_etags(if_none_match) or if_none_match.strip() == "*")
+
+
+def not_modified(request, etag):
+    """Return a 304 response if the client already holds ``etag``, else None."""
+    if etag_matches(request, etag):
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    return None
@@ -0,0 +1,17 @@
+"""
+URL configuration for requests served through ASGI (ASGI_ROOT_URLCONF, set
+per request by core.middleware.asgi_urlconf_middleware).
+
+The hot read paths and login/registration are matched first and served by
+native async views; everything else falls through to core.urls.
+"""
+from django.urls import path, include
+
+from core.urls import urlpatterns as sync_urlpatterns
+
+urlpatterns = [
+    path('api/', include('user_auth_app.api.async_urls')),
+    path('api/', include('boards_app.api.async_urls')),
+    path('api/', include('tasks_app.api.async_urls')),
+    *sync_urlpatterns,
+]
@@ -0,0 +1,77 @@
+"""Plumbing for the native async views that the ASGI deployment serves.
+
+DRF views are synchronous, so under ASGI each request hops to a worker
+thread. The hot read paths are therefore also written as plain Django async
+views; ``core.asgi_urls`` routes them ahead of the regular API.
+"""
+import functools
+import json
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponseNotModified, JsonResponse
+from django.urls import resolve
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.exceptions import APIException, ParseError
+
+from user_auth_app.authentication import aauthenticate
+
+
+def async_api_view(view=None, *, authenticated=True, token_in_query=False):
+    """Authenticate by token and turn DRF exceptions into JSON error responses."""
+    if view is None:
+        return functools.partial(async_api_view, authenticated=authenticated, token_in_query=token_in_query)
+
+    @csrf_exempt
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        try:
+            if authenticated:
+                request.user = await aauthenticate(request, allow_query=token_in_query)
+            return await view(request, *args, **kwargs)
+        except APIException as error:
+            return error_response(error)
+
+    return wrapper
+
+
+def error_response(error):
+    detail = error.detail
+    data = detail if isinstance(detail, (list, dict)) else {"detail": detail}
+    response = api_response(data, status=error.status_code)
+    if error.status_code == 401:
+        response["WWW-Authenticate"] = "Token"
+    return response
+
+
+def api_response(data, status=200, headers=None):
+    return JsonResponse(data, status=status, headers=headers, safe=False, json_dumps_params={"ensure_ascii": False})
+
+
+def not_modified(etag):
+    response = HttpResponseNotModified()
+    response["ETag"] = etag
+    return response
+
+
+def request_data(request):
+    if request.content_type == "application/json":
+        try:
+            return json.loads(request.body or b"{}")
+        except ValueError as error:
+            raise ParseError(f"JSON parse error - {error}")
+    return request.POST
+
+
+def reads_async(view):
+    """Serve GET with the async ``view`` and hand every other method to the
+    synchronous API view that core.urls maps the same path to."""
+
+    @csrf_exempt
+    @functools.wraps(view)
+    async def dispatch(request, *args, **kwargs):
+        if request.method == "GET":
+            return await view(request, *args, **kwargs)
+        match = resolve(request.path_info, urlconf="core.urls")
+        return await sync_to_async(match.func)(request, *match.args, **match.kwargs)
+
+    return dispatch
@@ -0,0 +1,54 @@
+"""Send reads to the replica databases and everything else to the primary.
+
+Replica reads are opt-in per request: ReplicaStickinessMiddleware enables them
+for safe requests of clients that have not written recently, so management
+commands, shell sessions and write requests always read from the primary.
+Reads whose result goes into a shared cache use ``primary_reads``.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+replica_reads = ContextVar("replica_reads", default=False)
+
+
+@contextmanager
+def primary_reads():
+    """Read from the primary inside the block, even on a replica-enabled request.
+
+    For results that get cached: a lagging replica's state would otherwise
+    be served to everyone from the cache, long after the replica caught up.
+    """
+    token = replica_reads.set(False)
+    try:
+        yield
+    finally:
+        replica_reads.reset(token)
+
+
+class PrimaryReplicaRouter:
+    # Tokens stay on the primary so a token issued by /login/ works right away.
+    replica_app_labels = {"boards_app", "tasks_app", "auth"}
+
+    def db_for_read(self, model, **hints):
+        if (
+            not settings.DATABASE_REPLICAS
+            or not replica_reads.get()
+            or model._meta.app_label not in self.replica_app_labels
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+        return random.choice(settings.DATABASE_REPLICAS)
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas are copies of the primary and are never migrated themselves.
+        return db == DEFAULT_DB_ALIAS
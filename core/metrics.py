@@ -0,0 +1,104 @@
+"""Per-request SQL recording and per-endpoint aggregates for the metrics endpoint.
+
+Aggregates live in process memory, so each worker reports its own traffic.
+"""
+import random
+import re
+import statistics
+import threading
+import time
+from collections import Counter
+
+PLACEHOLDER_LIST = re.compile(r"\((?:%s|\?)(?:,\s*(?:%s|\?))+\)")
+
+
+def query_shape(sql):
+    """Collapse IN lists so the same query with a different number of ids has one shape."""
+    return PLACEHOLDER_LIST.sub("(...)", sql)
+
+
+class QueryRecorder:
+    """``connection.execute_wrapper`` callable that counts and times every query."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.shapes[query_shape(sql)] += 1
+
+    def duplicates(self):
+        """Query shapes that ran more than once, most repeated first."""
+        return [(shape, count) for shape, count in self.shapes.most_common() if count > 1]
+
+
+class EndpointStats:
+    """Request count plus a fixed-size uniform sample (reservoir) of recent requests."""
+
+    def __init__(self, size):
+        self.size = size
+        self.requests = 0
+        self.with_duplicates = 0
+        self.samples = []
+
+    def add(self, sample, has_duplicates):
+        self.requests += 1
+        self.with_duplicates += has_duplicates
+        if len(self.samples) < self.size:
+            self.samples.append(sample)
+        else:
+            index = random.randrange(self.requests)
+            if index < self.size:
+                self.samples[index] = sample
+
+    def summary(self):
+        latencies, queries, db_times = zip(*self.samples)
+        return {
+            "requests": self.requests,
+            "requests_with_duplicate_queries": self.with_duplicates,
+            "latency_ms": percentiles(latencies),
+            "db_ms": percentiles(db_times),
+            "queries": {"mean": round(statistics.fmean(queries), 2), **percentiles(queries)},
+        }
+
+
+def percentiles(values):
+    values = sorted(values)
+    return {
+        "p50": round(statistics.median(values), 2),
+        "p95": round(values[min(len(values) - 1, int(len(values) * 0.95))], 2),
+    }
+
+
+class EndpointMetrics:
+
+    def __init__(self, reservoir_size=1024):
+        self.reservoir_size = reservoir_size
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, latency_ms, recorder):
+        sample = (latency_ms, recorder.count, recorder.duration * 1000)
+        with self._lock:
+            stats = self._endpoints.get(endpoint)
+            if stats is None:
+                stats = self._endpoints[endpoint] = EndpointStats(self.reservoir_size)
+            stats.add(sample, bool(recorder.duplicates()))
+
+    def snapshot(self):
+        with self._lock:
+            return {endpoint: stats.summary() for endpoint, stats in sorted(self._endpoints.items())}
+
+    def clear(self):
+        with self._lock:
+            self._endpoints.clear()
+
+
+endpoint_metrics = EndpointMetrics()
@@ -0,0 +1,188 @@
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.handlers.asgi import ASGIRequest
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.utils.decorators import sync_and_async_middleware
+
+from core.db_router import replica_reads
+from core.metrics import QueryRecorder, endpoint_metrics
+from user_auth_app.authentication import get_token_key
+
+logger = logging.getLogger("core.queries")
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+def primary_pin_key(request):
+    key = get_token_key(request)
+    return f"db-primary-pin:{key}" if key else None
+
+
+def reads_from_replica(request):
+    if request.method not in SAFE_METHODS:
+        return False
+    key = primary_pin_key(request)
+    return key is None or cache.get(key) is None
+
+
+def remember_write(request):
+    key = primary_pin_key(request)
+    if key and request.method not in SAFE_METHODS:
+        cache.set(key, True, settings.REPLICA_STICKY_SECONDS)
+
+
+@sync_and_async_middleware
+def replica_stickiness_middleware(get_response):
+    """Read from replicas only on safe requests, and keep a client that just
+    wrote on the primary for REPLICA_STICKY_SECONDS so it sees its own writes.
+
+    Clients are told apart by their token; with several processes the default
+    cache has to be shared for the pin to hold across them.
+    """
+    if not settings.DATABASE_REPLICAS:
+        raise MiddlewareNotUsed()
+
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            context = replica_reads.set(reads_from_replica(request))
+            try:
+                response = await get_response(request)
+            finally:
+                replica_reads.reset(context)
+            remember_write(request)
+            return response
+    else:
+        def middleware(request):
+            context = replica_reads.set(reads_from_replica(request))
+            try:
+                response = get_response(request)
+            finally:
+                replica_reads.reset(context)
+            remember_write(request)
+            return response
+
+    return middleware
+
+
+def use_asgi_urlconf(request):
+    if isinstance(request, ASGIRequest):
+        request.urlconf = settings.ASGI_ROOT_URLCONF
+
+
+@sync_and_async_middleware
+def asgi_urlconf_middleware(get_response):
+    """Resolve requests that come in through ASGI against ASGI_ROOT_URLCONF,
+    which serves the hot reads as native async views; WSGI requests keep
+    ROOT_URLCONF. Decided per request, so no process-wide switch is needed.
+    """
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            use_asgi_urlconf(request)
+            return await get_response(request)
+    else:
+        def middleware(request):
+            use_asgi_urlconf(request)
+            return get_response(request)
+
+    return middleware
+
+
+def endpoint_name(request):
+    match = request.resolver_match
+    return f"{request.method} /{match.route}" if match else f"{request.method} <unmatched>"
+
+
+# The recorder of the request being sampled. Connections belong to threads,
+# and under ASGI the ORM runs in sync_to_async worker threads; those copy the
+# request's context, so a wrapper installed on every connection finds the
+# recorder wherever the query runs.
+current_recorder = ContextVar("current_recorder", default=None)
+
+
+def record_query(execute, sql, params, many, context):
+    recorder = current_recorder.get()
+    if recorder is None:
+        return execute(sql, params, many, context)
+    return recorder(execute, sql, params, many, context)
+
+
+def install_query_recording(connection):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+@receiver(connection_created)
+def record_new_connection(sender, connection, **kwargs):
+    install_query_recording(connection)
+
+
+@contextmanager
+def recording_queries(recorder):
+    # Connections of this thread may predate the receiver above.
+    for alias in connections:
+        install_query_recording(connections[alias])
+    token = current_recorder.set(recorder)
+    try:
+        yield recorder
+    finally:
+        current_recorder.reset(token)
+
+
+def finish_recording(request, response, recorder, started):
+    latency_ms = (time.perf_counter() - started) * 1000
+    endpoint = endpoint_name(request)
+    endpoint_metrics.record(endpoint, latency_ms, recorder)
+
+    timing = [f'db;dur={recorder.duration * 1000:.2f};desc="{recorder.count} queries"', f"total;dur={latency_ms:.2f}"]
+    duplicates = recorder.duplicates()
+    if duplicates:
+        shape, count = duplicates[0]
+        timing.append(f'dup;desc="{len(duplicates)} repeated shapes, worst x{count}"')
+        if count >= settings.QUERY_METRICS_DUPLICATE_THRESHOLD:
+            logger.warning("%s ran the same query %d times (possible N+1): %s", endpoint, count, shape)
+    response["Server-Timing"] = ", ".join(timing)
+
+
+@sync_and_async_middleware
+def query_metrics_middleware(get_response):
+    """Count and time the SQL of a sample of requests, report it in Server-Timing
+    and feed the per-endpoint aggregates behind /api/metrics/.
+
+    Works on the sync and the async stack, see ``current_recorder``.
+    Unsampled requests only pay a ContextVar lookup per query, so
+    QUERY_METRICS_SAMPLE_RATE bounds the overhead.
+    """
+    sample_rate = settings.QUERY_METRICS_SAMPLE_RATE
+    if sample_rate <= 0:
+        raise MiddlewareNotUsed()
+
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            if random.random() >= sample_rate:
+                return await get_response(request)
+            recorder, started = QueryRecorder(), time.perf_counter()
+            with recording_queries(recorder):
+                response = await get_response(request)
+            finish_recording(request, response, recorder, started)
+            return response
+    else:
+        def middleware(request):
+            if random.random() >= sample_rate:
+                return get_response(request)
+            recorder, started = QueryRecorder(), time.perf_counter()
+            with recording_queries(recorder):
+                response = get_response(request)
+            finish_recording(request, response, recorder, started)
+            return response
+
+    return middleware
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -45,7 +46,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.asgi_urlconf_middleware',
+    'core.middleware.query_metrics_middleware',
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.replica_stickiness_middleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -55,6 +59,9 @@ MIDDLEWARE = [
 ]
 
 ROOT_URLCONF = 'core.urls'
+# Requests served through ASGI resolve here instead (core.middleware.asgi_urlconf_middleware):
+# the hot reads as native async views, everything else falls through to core.urls.
+ASGI_ROOT_URLCONF = 'core.asgi_urls'
 
 TEMPLATES = [
     {
@@ -77,13 +84,91 @@ WSGI_APPLICATION = 'core.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# SQLITE_PROFILE=production switches to WAL, so readers keep going while a
+# writer commits, and opens write transactions with BEGIN IMMEDIATE: the write
+# lock is taken up front and a busy connection retries for up to
+# SQLITE_BUSY_TIMEOUT seconds instead of failing a lock upgrade halfway through.
+# Deployments opt in through the environment. The stock rollback journal stays
+# the default, because switching journal_mode rewrites the database header:
+# any manage.py command would otherwise modify the checked-in db.sqlite3.
+SQLITE_PROFILE = os.environ.get('SQLITE_PROFILE', 'default')
+SQLITE_BUSY_TIMEOUT = float(os.environ.get('SQLITE_BUSY_TIMEOUT', '5'))
+SQLITE_MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024)))
+SQLITE_CACHE_SIZE_KB = int(os.environ.get('SQLITE_CACHE_SIZE_KB', str(64 * 1024)))
+
+SQLITE_PROFILES = {
+    'default': {},
+    'production': {
+        'init_command': ';'.join([
+            'PRAGMA journal_mode=WAL',
+            'PRAGMA synchronous=NORMAL',
+            f'PRAGMA mmap_size={SQLITE_MMAP_SIZE}',
+            f'PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}',
+            'PRAGMA temp_store=MEMORY',
+        ]),
+        'transaction_mode': 'IMMEDIATE',
+        'timeout': SQLITE_BUSY_TIMEOUT,
+    },
+}
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': SQLITE_PROFILES[SQLITE_PROFILE],
+        # Keep connections open across requests; DB_CONN_MAX_AGE=0 reconnects per request.
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', '600')),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# Read replicas: DB_REPLICA_PATHS is a comma-separated list of SQLite files kept
+# in sync with the primary (locally: python manage.py sync_sqlite_replicas).
+# Safe requests read boards, tasks and users from them; a client that wrote
+# stays on the primary for REPLICA_STICKY_SECONDS.
+DATABASE_REPLICAS = []
+for index, path in enumerate(filter(None, os.environ.get('DB_REPLICA_PATHS', '').split(',')), start=1):
+    DATABASES[f'replica_{index}'] = {**DATABASES['default'], 'NAME': path, 'TEST': {'MIRROR': 'default'}}
+    DATABASE_REPLICAS.append(f'replica_{index}')
+
+DATABASE_ROUTERS = ['core.db_router.PrimaryReplicaRouter']
+REPLICA_STICKY_SECONDS = int(os.environ.get('REPLICA_STICKY_SECONDS', '10'))
+
+
+AUTHENTICATION_BACKENDS = [
+    'user_auth_app.backends.EmailBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+# Token lookups, board access answers and replica pins are invalidated
+# through the default cache, which only reaches every worker process when it
+# is shared: set REDIS_URL for multi-process deployments. Without it each
+# process caches on its own and SHARED_CACHE is False, which shortens the
+# token and board access timeouts below.
+REDIS_URL = os.environ.get('REDIS_URL')
+SHARED_CACHE = bool(REDIS_URL)
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL,
+    } if SHARED_CACHE else {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+    # Per-user board list responses, see boards_app.list_cache.
+    'board_lists': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'board-lists',
+        'TIMEOUT': 300,
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    },
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -131,6 +216,38 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'user_auth_app.authentication.CachedTokenAuthentication',
     ]
-}
\ No newline at end of file
+}
+
+# Seconds a cached (user, board) membership lookup stays valid. Entries are
+# also dropped explicitly whenever the board owner or its members change; with
+# a per-process cache other processes only notice when the entry expires.
+BOARD_ACCESS_CACHE_TIMEOUT = 300 if SHARED_CACHE else 10
+
+# Token lookups are cached in Django's cache for TOKEN_CACHE_TIMEOUT seconds
+# and in a per-process LRU for TOKEN_CACHE_LOCAL_TIMEOUT seconds. A revoked
+# token keeps working in other processes until both have expired.
+TOKEN_CACHE_TIMEOUT = 300 if SHARED_CACHE else 10
+TOKEN_CACHE_LOCAL_TIMEOUT = 10
+TOKEN_CACHE_LOCAL_MAX_ENTRIES = 10000
+
+# Live board events (GET /api/boards/{id}/events/). The backend fans events
+# out; swap LocalBackend for a broker-backed one when running several processes.
+BOARD_EVENTS_BACKEND = 'boards_app.events.LocalBackend'
+BOARD_EVENTS_QUEUE_SIZE = 100
+BOARD_EVENTS_KEEPALIVE = 15
+
+# Threads that hash passwords for the async login/registration views; more
+# concurrent logins queue instead of starving the event loop or the CPU.
+PASSWORD_HASHER_THREADS = 2
+
+# Card rank keys longer than this get their column re-spaced in the background
+# (tasks_app.ranking); python manage.py rebalance_task_ranks does it on demand.
+TASK_RANK_MAX_LENGTH = 24
+
+# Share of requests whose SQL is counted and timed (Server-Timing header and
+# GET /api/metrics/ for staff); 0 turns the instrumentation off. A query shape
+# repeated QUERY_METRICS_DUPLICATE_THRESHOLD times in one request is logged.
+QUERY_METRICS_SAMPLE_RATE = float(os.environ.get('QUERY_METRICS_SAMPLE_RATE', '1' if DEBUG else '0.05'))
+QUERY_METRICS_DUPLICATE_THRESHOLD = 5
@@ -0,0 +1,128 @@
+import asyncio
+from unittest import mock
+
+from django.db import connections
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from rest_framework import status
+
+from benchmarks.testing import SeededAPITestCase, reset_caches
+from boards_app.api.views import build_board_list
+from boards_app.membership import has_board_access
+from boards_app.models import Board
+from core.db_router import PrimaryReplicaRouter
+from core.middleware import replica_stickiness_middleware
+from tasks_app.models import Task
+
+
+class ASGIUrlconfTests(SeededAPITestCase):
+    """ASGI requests resolve against ASGI_ROOT_URLCONF, WSGI requests against ROOT_URLCONF."""
+
+    def test_wsgi_request(self):
+        response = self.client.get(f"/api/boards/{self.board.pk}/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.resolver_match.url_name, "board-detail")
+
+    async def test_asgi_request(self):
+        response = await self.async_client.get(
+            f"/api/boards/{self.board.pk}/", headers={"Authorization": f"Token {self.user.auth_token.key}"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.resolver_match.url_name, "board-detail-async")
+
+
+@override_settings(DATABASE_REPLICAS=["replica_1"], REPLICA_STICKY_SECONDS=10)
+class ReplicaRoutingTests(SimpleTestCase):
+    """Safe requests read boards and tasks from a replica, except right after the client wrote."""
+
+    def setUp(self):
+        reset_caches()
+        self.factory = RequestFactory()
+        self.reads_from = []
+
+        def get_response(request):
+            self.reads_from.append(PrimaryReplicaRouter().db_for_read(Task))
+            return None
+
+        self.middleware = replica_stickiness_middleware(get_response)
+        patcher = mock.patch.object(connections["default"], "in_atomic_block", False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def request(self, method, token=None):
+        headers = {"Authorization": f"Token {token}"} if token else {}
+        self.middleware(getattr(self.factory, method)("/api/boards/", headers=headers))
+        return self.reads_from[-1]
+
+    def test_reads_go_to_replica(self):
+        self.assertEqual(self.request("get", "a"), "replica_1")
+        self.assertEqual(self.request("get"), "replica_1")
+
+    def test_writes_and_reads_after_them_stay_on_primary(self):
+        self.assertEqual(self.request("post", "a"), "default")
+        self.assertEqual(self.request("get", "a"), "default")
+        # Other clients are not pinned.
+        self.assertEqual(self.request("get", "b"), "replica_1")
+
+    def test_pin_expires(self):
+        with override_settings(REPLICA_STICKY_SECONDS=0):
+            self.request("patch", "a")
+        self.assertEqual(self.request("get", "a"), "replica_1")
+
+    def test_outside_requests_read_primary(self):
+        # Management commands and shells never opt in to replica reads.
+        self.assertEqual(PrimaryReplicaRouter().db_for_read(Task), "default")
+
+    def test_cache_fills_read_primary(self):
+        # What goes into the shared cache must not come from a lagging replica.
+        def read(*args):
+            self.reads_from.append(PrimaryReplicaRouter().db_for_read(Board))
+            return []
+
+        boards = mock.MagicMock()
+        boards.order_by.return_value.values_list.side_effect = read
+        user = mock.Mock(pk=1)
+
+        def get_response(request):
+            request.user = user
+            has_board_access(user, 1)
+            build_board_list(request, boards, 0)
+
+        with mock.patch("boards_app.membership.Board.objects") as objects:
+            objects.alive.return_value.filter.return_value.exists.side_effect = read
+            replica_stickiness_middleware(get_response)(self.factory.get("/api/boards/"))
+        self.assertEqual(self.reads_from, ["default", "default"])
+
+    def test_async_stack(self):
+        async def get_response(request):
+            self.reads_from.append(PrimaryReplicaRouter().db_for_read(Task))
+
+        middleware = replica_stickiness_middleware(get_response)
+
+        async def requests():
+            for method in ["get", "delete", "get"]:
+                await middleware(getattr(self.factory, method)("/api/boards/", headers={"Authorization": "Token a"}))
+
+        asyncio.run(requests())
+        self.assertEqual(self.reads_from, ["replica_1", "default", "default"])
+
+
+@override_settings(QUERY_METRICS_SAMPLE_RATE=1)
+class QueryMetricsTests(SeededAPITestCase):
+    """Sampled responses report the SQL they ran, on the WSGI and the ASGI stack."""
+
+    def query_count(self, response):
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        timing = response["Server-Timing"]
+        return int(timing.split('desc="', 1)[1].split(" ", 1)[0])
+
+    def test_sync_stack(self):
+        response = self.client.get(f"/api/boards/{self.board.pk}/")
+        self.assertEqual(self.query_count(response), 6)
+
+    async def test_async_stack(self):
+        headers = {"Authorization": f"Token {self.user.auth_token.key}"}
+        # A native async view and a DRF view running in a sync_to_async thread.
+        for path in ["/api/tasks/", f"/api/boards/{self.board.pk}/changes/"]:
+            with self.subTest(path=path):
+                response = await self.async_client.get(path, headers=headers)
+                self.assertGreater(self.query_count(response), 0)
@@ -0,0 +1,17 @@
+from django.conf import settings
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core.metrics import endpoint_metrics
+
+
+class MetricsView(APIView):
+    """Per-endpoint latency and query aggregates of this process's sampled requests."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response({
+            "sample_rate": settings.QUERY_METRICS_SAMPLE_RATE,
+            "endpoints": endpoint_metrics.snapshot(),
+        })
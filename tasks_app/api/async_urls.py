@@ -0,0 +1,11 @@
+from django.urls import path
+
+from core.async_api import reads_async
+from .async_views import assigned_to_me, reviewing, task_comments, task_list
+
+urlpatterns = [
+    path('tasks/', reads_async(task_list), name='tasks-list-async'),
+    path('tasks/assigned-to-me/', reads_async(assigned_to_me), name='tasks-assigned-to-me-async'),
+    path('tasks/reviewing/', reads_async(reviewing), name='tasks-reviewing-async'),
+    path('tasks/<int:pk>/comments/', reads_async(task_comments), name='tasks-comments-async'),
+]
@@ -0,0 +1,53 @@
+from rest_framework.exceptions import NotFound
+
+from boards_app.versioning import etag_matches, versions_etag
+from core.async_api import api_response, async_api_view, not_modified
+from tasks_app.models import Comment, Task
+from .pagination import KeysetPagination
+from .serializers import CommentSerializer, TaskFilterSerializer, TaskResponseSerializer
+from .views import task_list_versions
+
+
+async def paginated_response(request, queryset, serializer_class, headers=None, ordering=None):
+    paginator = KeysetPagination(ordering)
+    page = await paginator.apaginate_queryset(queryset, request)
+    data = serializer_class(page, many=True).data
+    return api_response(paginator.get_paginated_data(data), headers=headers)
+
+
+async def filtered_tasks_response(request, tasks, headers=None):
+    filters = TaskFilterSerializer(data=request.GET)
+    filters.is_valid(raise_exception=True)
+    return await paginated_response(
+        request, filters.filter(tasks), TaskResponseSerializer, headers=headers, ordering=filters.keyset_ordering
+    )
+
+
+@async_api_view
+async def task_list(request):
+    versions = [entry async for entry in task_list_versions(request.user)]
+    etag = versions_etag("tasks", request.user.pk, request.get_full_path(), versions)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    tasks = Task.objects.visible_to(request.user).for_response()
+    return await filtered_tasks_response(request, tasks, headers={"ETag": etag})
+
+
+@async_api_view
+async def assigned_to_me(request):
+    tasks = Task.objects.filter(assignee=request.user).on_alive_boards().for_response()
+    return await filtered_tasks_response(request, tasks)
+
+
+@async_api_view
+async def reviewing(request):
+    tasks = Task.objects.filter(reviewer=request.user).on_alive_boards().for_response()
+    return await filtered_tasks_response(request, tasks)
+
+
+@async_api_view
+async def task_comments(request, pk):
+    if not await Task.objects.visible_to(request.user).filter(pk=pk).aexists():
+        raise NotFound("No Task matches the given query.")
+    comments = Comment.objects.filter(task_id=pk).select_related("author")
+    return await paginated_response(request, comments, CommentSerializer)
@@ -0,0 +1,152 @@
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from boards_app.models import Board
+from tasks_app.models import Task
+from tasks_app.signals import tasks_bulk_saved
+from .serializers import TaskBulkDataSerializer, TaskResponseSerializer
+
+User = get_user_model()
+
+
+class BulkTaskOperations:
+    """Validate and apply a batch of task create/update/delete operations.
+
+    Every operation's data is validated first; everything the valid ones refer
+    to (tasks, boards, users) is then loaded with one query per kind, so
+    validation cost does not grow with the batch. Deletes are set-based.
+
+    Call ``is_valid`` and ``save`` in one transaction, so the loaded rows
+    cannot change before they are written back, all or nothing.
+    """
+
+    def __init__(self, user, operations):
+        self.user = user
+        self.operations = operations
+        self.errors = [None] * len(operations)
+        self.validated = [None] * len(operations)
+
+    def is_valid(self):
+        self.data = [self.validate_data(index, operation) for index, operation in enumerate(self.operations)]
+        self.load_references()
+        seen_ids = set()
+        for index, operation in enumerate(self.operations):
+            if self.errors[index]:
+                continue
+            try:
+                self.validated[index] = self.validate_operation(operation, self.data[index], seen_ids)
+            except BulkOperationError as error:
+                self.errors[index] = error.detail
+        return not any(self.errors)
+
+    def validate_data(self, index, operation):
+        """Field validation of one operation, before any of its values is looked up."""
+        kind = operation["op"]
+        if kind == "delete":
+            return {}
+        serializer = TaskBulkDataSerializer(data=operation["data"], partial=kind == "update")
+        if not serializer.is_valid():
+            self.errors[index] = serializer.errors
+            return {}
+        return serializer.validated_data
+
+    def load_references(self):
+        task_ids = {
+            op["id"] for op, error in zip(self.operations, self.errors) if op["op"] != "create" and not error
+        }
+        self.tasks = Task.objects.visible_to(self.user).in_bulk(task_ids)
+
+        board_ids = {task.board_id for task in self.tasks.values()}
+        user_ids = set()
+        for data in self.data:
+            board_ids.add(data.get("board_id"))
+            user_ids.update([data.get("assignee_id"), data.get("reviewer_id")])
+        board_ids.discard(None)
+        user_ids.discard(None)
+
+        self.board_owners = dict(
+            Board.objects.visible_to(self.user).filter(pk__in=board_ids).values_list("pk", "owner_id")
+        )
+        self.user_ids = set(User.objects.filter(pk__in=user_ids).values_list("pk", flat=True))
+
+    def validate_operation(self, operation, data, seen_ids):
+        kind = operation["op"]
+        task = None
+        if kind != "create":
+            task = self.tasks.get(operation["id"])
+            if task is None:
+                raise BulkOperationError({"id": ["Task nicht gefunden."]})
+            if task.pk in seen_ids:
+                raise BulkOperationError({"id": ["Task kommt mehrfach im Batch vor."]})
+            seen_ids.add(task.pk)
+
+        if kind == "delete":
+            if self.board_owners.get(task.board_id) != self.user.id and task.assignee_id != self.user.id:
+                raise BulkOperationError({"detail": "Nur Owner oder Assignee dürfen löschen."})
+            return operation, task, {}
+
+        board_id = data.get("board_id", task.board_id if task else None)
+        if board_id not in self.board_owners:
+            raise BulkOperationError({"board": ["Kein Zugriff auf dieses Board."]})
+        for field in ("assignee_id", "reviewer_id"):
+            if data.get(field) is not None and data[field] not in self.user_ids:
+                raise BulkOperationError({field: ["Ungültige Benutzer-ID."]})
+        return operation, task, data
+
+    def save(self):
+        now = timezone.now()
+        created, updated, deleted, update_fields = [], [], [], {"updated_at"}
+        self.written = []
+        for operation, task, data in self.validated:
+            if operation["op"] == "create":
+                task = Task(created_by=self.user, created_at=now, updated_at=now, **data)
+                created.append(task)
+            elif operation["op"] == "update":
+                updated.append((task, task.stats_key()))
+                for field, value in data.items():
+                    setattr(task, field, value)
+                task.updated_at = now
+                update_fields.update(data)
+            else:
+                deleted.append(task)
+            self.written.append(task)
+
+        # New cards and cards moved to another column go to the end of it.
+        moved = [task for task, previous in updated if previous[:2] != task.stats_key()[:2]]
+        if created or moved:
+            Task.objects.place_last(created + moved)
+        if moved:
+            update_fields.add("rank")
+        Task.objects.bulk_create(created)
+        if updated:
+            Task.objects.bulk_update([task for task, _ in updated], sorted(update_fields))
+        if deleted:
+            Task.objects.filter(pk__in=[task.pk for task in deleted]).delete_with_comments()
+        tasks_bulk_saved.send(sender=Task, created=created, updated=updated, deleted=deleted)
+
+    def results(self):
+        tasks = Task.objects.for_response().in_bulk(
+            task.pk for (operation, _, _), task in zip(self.validated, self.written) if operation["op"] != "delete"
+        )
+        results = []
+        for (operation, _, _), task in zip(self.validated, self.written):
+            result = {"op": operation["op"], "id": task.pk}
+            if operation["op"] == "delete":
+                result["status"] = 204
+            else:
+                result["status"] = 201 if operation["op"] == "create" else 200
+                result["task"] = TaskResponseSerializer(tasks[task.pk]).data
+            results.append(result)
+        return results
+
+    def error_results(self):
+        return [
+            {"op": operation["op"], "id": operation.get("id"), "status": 400 if error else None, "errors": error}
+            for operation, error in zip(self.operations, self.errors)
+        ]
+
+
+class BulkOperationError(Exception):
+
+    def __init__(self, detail):
+        self.detail = detail
@@ -0,0 +1,167 @@
+import base64
+import json
+
+from django.core.exceptions import FieldDoesNotExist
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import F, Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """Cursor pagination that seeks on ``ordering`` instead of using OFFSET.
+
+    The cursor is the opaque, encoded sort key of the last row on the page,
+    so every page is an index range scan no matter how deep it is. The last
+    ordering field has to be unique. NULLs of nullable fields sort last in
+    either direction.
+    """
+    ordering = ("created_at", "id")
+    page_size = 50
+    max_page_size = 200
+    page_size_query_param = "page_size"
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Ungültiger Cursor."
+
+    def __init__(self, ordering=None):
+        if ordering is not None:
+            self.ordering = ordering
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.finish_page(list(self.page_queryset(queryset, request)))
+
+    async def apaginate_queryset(self, queryset, request):
+        """Async variant for native async views, which pass a plain Django request."""
+        return self.finish_page([obj async for obj in self.page_queryset(queryset, request)])
+
+    def page_queryset(self, queryset, request):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.nullable = {
+            field.lstrip("-") for field in self.ordering if self.is_nullable(queryset.model, field.lstrip("-"))
+        }
+        queryset = queryset.order_by(*map(self.order_expression, self.ordering))
+
+        cursor = self.query_params(request).get(self.cursor_query_param)
+        if cursor:
+            position = self.decode_cursor(cursor, queryset.model)
+            try:
+                queryset = queryset.filter(self.seek_filter(position))
+            except (DjangoValidationError, ValueError, TypeError):
+                raise self.invalid_cursor()
+        return queryset[:self.page_size + 1]
+
+    def finish_page(self, page):
+        self.has_next = len(page) > self.page_size
+        page = page[:self.page_size]
+        self.next_position = self.position(page[-1]) if self.has_next else None
+        return page
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
+
+    def get_paginated_data(self, data):
+        return {"next": self.get_next_link(), "results": data}
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def query_params(self, request):
+        return getattr(request, "query_params", request.GET)
+
+    def get_page_size(self, request):
+        try:
+            size = int(self.query_params(request)[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def get_next_link(self):
+        url = self.request.build_absolute_uri()
+        if self.next_position is None:
+            return None
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.next_position))
+
+    def get_previous_link(self):
+        return None
+
+    def position(self, obj):
+        return [self.field_value(obj, field.lstrip("-")) for field in self.ordering]
+
+    def field_value(self, obj, name):
+        value = getattr(obj, name)
+        return value.isoformat() if hasattr(value, "isoformat") else value
+
+    def is_nullable(self, model, name):
+        try:
+            return model._meta.get_field(name).null
+        except FieldDoesNotExist:
+            return False
+
+    def order_expression(self, field):
+        name = field.lstrip("-")
+        if name not in self.nullable:
+            return field
+        return F(name).desc(nulls_last=True) if field.startswith("-") else F(name).asc(nulls_last=True)
+
+    def seek_filter(self, position):
+        condition, equal = Q(), Q()
+        for field, value in zip(self.ordering, position):
+            name = field.lstrip("-")
+            if value is None:
+                # Past the last non-NULL value only further NULL rows follow.
+                equal &= Q(**{f"{name}__isnull": True})
+                continue
+            lookup = "lt" if field.startswith("-") else "gt"
+            after = Q(**{f"{name}__{lookup}": value})
+            if name in self.nullable:
+                after |= Q(**{f"{name}__isnull": True})
+            condition |= equal & after
+            equal &= Q(**{name: value})
+        return condition
+
+    def encode_cursor(self, position):
+        return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+    def decode_cursor(self, cursor, model):
+        try:
+            position = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        except (ValueError, TypeError):
+            raise self.invalid_cursor()
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise self.invalid_cursor()
+        return [self.cursor_value(model, field.lstrip("-"), value) for field, value in zip(self.ordering, position)]
+
+    def cursor_value(self, model, name, value):
+        """``value`` parsed as the type of the ordering field; anything else is an invalid cursor."""
+        if value is None and name in self.nullable:
+            return None
+        if value is None or isinstance(value, (bool, list, dict)):
+            raise self.invalid_cursor()
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            # Annotations such as search_rank are numeric.
+            if isinstance(value, (int, float)):
+                return value
+            raise self.invalid_cursor()
+        try:
+            return field.to_python(value)
+        except (DjangoValidationError, ValueError, TypeError):
+            raise self.invalid_cursor()
+
+    def invalid_cursor(self):
+        return ValidationError({self.cursor_query_param: self.invalid_cursor_message})
+
+class SearchPagination(KeysetPagination):
+    """Best bm25 match first; bm25 scores are negative, lower is better."""
+    ordering = ("search_rank", "id")
@@ -1,14 +1,15 @@
 from rest_framework.permissions import BasePermission
 
+from boards_app.membership import has_board_access
+
 
 class IsTaskAssigneeOrBoardMember(BasePermission):
 
     def has_object_permission(self, request, view, obj):
         return (
-            request.user == obj.assignee
-            or request.user == obj.created_by
-            or request.user == obj.board.owner
-            or request.user in obj.board.members.all()
+            request.user.id == obj.assignee_id
+            or request.user.id == obj.created_by_id
+            or has_board_access(request.user, obj.board_id)
         )
 
     def has_permission(self, request, view):
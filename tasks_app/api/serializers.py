@@ -48,7 +48,7 @@ class TaskCreateSerializer(serializers.ModelSerializer):
 class TaskResponseSerializer(serializers.ModelSerializer):
     assignee = UserNestedSerializer(read_only=True)
     reviewer = UserNestedSerializer(read_only=True)
-    comments_count = serializers.IntegerField(source="comments.count", read_only=True)
+    comments_count = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Task
@@ -62,8 +62,10 @@ class TaskResponseSerializer(serializers.ModelSerializer):
             "assignee",
             "reviewer",
             "due_date",
+            "rank",
             "comments_count",
         ]
+        read_only_fields = ["rank"]
 
 class CommentSerializer(serializers.ModelSerializer):
     author_email = serializers.ReadOnlyField(source="author.email")
@@ -71,3 +73,104 @@ class CommentSerializer(serializers.ModelSerializer):
     class Meta:
         model = Comment
         fields = ["id", "author_email", "content", "created_at"]
+
+
+class TaskBulkDataSerializer(serializers.ModelSerializer):
+    board = serializers.IntegerField(source="board_id")
+    assignee_id = serializers.IntegerField(required=False, allow_null=True)
+    reviewer_id = serializers.IntegerField(required=False, allow_null=True)
+
+    class Meta:
+        model = Task
+        fields = [
+            "board",
+            "title",
+            "description",
+            "status",
+            "priority",
+            "assignee_id",
+            "reviewer_id",
+            "due_date",
+        ]
+
+
+class TaskBulkOperationSerializer(serializers.Serializer):
+    op = serializers.ChoiceField(choices=["create", "update", "delete"])
+    id = serializers.IntegerField(required=False)
+    data = serializers.DictField(required=False, default=dict)
+
+    def validate(self, attrs):
+        if attrs["op"] != "create" and "id" not in attrs:
+            raise serializers.ValidationError({"id": "Für update und delete erforderlich."})
+        return attrs
+
+
+class TaskBulkSerializer(serializers.Serializer):
+    operations = TaskBulkOperationSerializer(many=True, allow_empty=False, max_length=500)
+
+
+class TaskMoveSerializer(serializers.Serializer):
+    """Target of a card move: the column and the cards it ends up between.
+
+    ``after_id`` is the card directly above, ``before_id`` the one directly
+    below; without either the card goes to the end of the column.
+    """
+    status = serializers.ChoiceField(choices=Task.STATUS_CHOICES, required=False)
+    after_id = serializers.IntegerField(required=False, allow_null=True)
+    before_id = serializers.IntegerField(required=False, allow_null=True)
+
+    def validate(self, attrs):
+        if attrs.get("after_id") is not None and attrs.get("after_id") == attrs.get("before_id"):
+            raise serializers.ValidationError({"before_id": "Muss sich von after_id unterscheiden."})
+        return attrs
+
+
+class TaskFilterSerializer(serializers.Serializer):
+    """Query parameters of the task lists: filters and a keyset ordering.
+
+    Every ordering ends on ``id`` so KeysetPagination can seek on it; tasks
+    without due date come last in both due_date directions.
+    """
+    ORDERINGS = {
+        "created_at": ("created_at", "id"),
+        "-created_at": ("-created_at", "-id"),
+        "updated_at": ("updated_at", "id"),
+        "-updated_at": ("-updated_at", "-id"),
+        "due_date": ("due_date", "id"),
+        "-due_date": ("-due_date", "-id"),
+        "title": ("title", "id"),
+        "-title": ("-title", "-id"),
+        "rank": ("rank", "id"),
+    }
+
+    status = serializers.ChoiceField(choices=Task.STATUS_CHOICES, required=False)
+    priority = serializers.ChoiceField(choices=Task.PRIORITY_CHOICES, required=False)
+    board = serializers.IntegerField(required=False)
+    assignee = serializers.IntegerField(required=False)
+    reviewer = serializers.IntegerField(required=False)
+    due_from = serializers.DateField(required=False)
+    due_to = serializers.DateField(required=False)
+    ordering = serializers.ChoiceField(choices=list(ORDERINGS), default="created_at")
+
+    def validate(self, attrs):
+        if "due_from" in attrs and "due_to" in attrs and attrs["due_from"] > attrs["due_to"]:
+            raise serializers.ValidationError({"due_to": "Darf nicht vor due_from liegen."})
+        return attrs
+
+    def filter(self, queryset):
+        lookups = {
+            "status": "status",
+            "priority": "priority",
+            "board": "board_id",
+            "assignee": "assignee_id",
+            "reviewer": "reviewer_id",
+            "due_from": "due_date__gte",
+            "due_to": "due_date__lte",
+        }
+        return queryset.filter(**{
+            lookup: self.validated_data[name] for name, lookup in lookups.items() if name in self.validated_data
+        })
+
+    @property
+    def keyset_ordering(self):
+        return self.ORDERINGS[self.validated_data["ordering"]]
@@ -2,29 +2,43 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from django.db import transaction
+from django.db.models import Q
+
+from boards_app.models import Board
+from boards_app.versioning import not_modified, versions_etag
 
 from tasks_app.models import Task, Comment
+from tasks_app.search import match_expression
+from .bulk import BulkTaskOperations
 from .serializers import (
     TaskCreateSerializer,
     TaskResponseSerializer,
+    TaskBulkSerializer,
+    TaskFilterSerializer,
+    TaskMoveSerializer,
     CommentSerializer,
 )
+from .pagination import KeysetPagination, SearchPagination
 from .permissions import IsTaskAssigneeOrBoardMember
 
 
 class TaskViewSet(viewsets.ModelViewSet):
     queryset = Task.objects.all()
     permission_classes = [IsAuthenticated, IsTaskAssigneeOrBoardMember]
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
-        user = self.request.user
-        return (
-            Task.objects.filter(board__owner=user)
-            | Task.objects.filter(board__members=user)
-            | Task.objects.filter(assignee=user)
-            | Task.objects.filter(created_by=user)
-        ).distinct()
+        return Task.objects.visible_to(self.request.user).for_response()
+
+    def filter_queryset(self, queryset):
+        if self.action not in ["list", "assigned_to_me", "reviewing"]:
+            return queryset
+        filters = TaskFilterSerializer(data=self.request.query_params)
+        filters.is_valid(raise_exception=True)
+        self.paginator.ordering = filters.keyset_ordering
+        return filters.filter(queryset)
 
     def get_serializer_class(self):
         if self.action in ["list", "assigned_to_me", "reviewing"]:
@@ -33,8 +47,18 @@ class TaskViewSet(viewsets.ModelViewSet):
             return TaskCreateSerializer
         return TaskResponseSerializer
 
+    def list(self, request, *args, **kwargs):
+        versions = list(task_list_versions(request.user))
+        etag = versions_etag("tasks", request.user.pk, request.get_full_path(), versions)
+        response = not_modified(request, etag)
+        if response is None:
+            response = super().list(request, *args, **kwargs)
+            response["ETag"] = etag
+        return response
+
     def perform_create(self, serializer):
         task = serializer.save(created_by=self.request.user)
+        task = Task.objects.for_response().get(pk=task.pk)
         response_serializer = TaskResponseSerializer(task)
         self.response_data = response_serializer.data
 
@@ -47,17 +71,57 @@ class TaskViewSet(viewsets.ModelViewSet):
 
     def destroy(self, request, *args, **kwargs):
         task = self.get_object()
-        if task.board.owner != request.user and task.assignee != request.user:
+        if task.board.owner_id != request.user.id and task.assignee_id != request.user.id:
             raise PermissionDenied("Nur Owner oder Assignee dürfen löschen.")
         task.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk(self, request):
+        serializer = TaskBulkSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        operations = BulkTaskOperations(request.user, serializer.validated_data["operations"])
+        with transaction.atomic():
+            if not operations.is_valid():
+                return Response({"results": operations.error_results()}, status=status.HTTP_400_BAD_REQUEST)
+            operations.save()
+        return Response({"results": operations.results()}, status=status.HTTP_200_OK)
+
+    @action(detail=True, methods=["post"], url_path="move")
+    def move(self, request, pk=None):
+        task = self.get_object()
+        serializer = TaskMoveSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        column_status = serializer.validated_data.get("status", task.status)
+        with transaction.atomic():
+            task.place(column_status, self.move_rank(task, column_status, serializer.validated_data))
+            task.save()
+        task = Task.objects.for_response().get(pk=task.pk)
+        return Response(TaskResponseSerializer(task).data, status=status.HTTP_200_OK)
+
+    def move_rank(self, task, column_status, neighbours):
+        column = Task.objects.filter(board_id=task.board_id, status=column_status).exclude(pk=task.pk)
+        after_id, before_id = neighbours.get("after_id"), neighbours.get("before_id")
+        try:
+            return column.rank_between_cards(after_id, before_id)
+        except Task.DoesNotExist:
+            raise ValidationError({"detail": "Nachbarkarten müssen in der Zielspalte liegen."})
+        except ValueError:
+            pass
+        # Neighbours with equal keys (concurrent moves): re-space the column once.
+        Task.objects.rebalance([(task.board_id, column_status)])
+        try:
+            return column.rank_between_cards(after_id, before_id)
+        except ValueError:
+            raise ValidationError({"after_id": "Muss in der Spalte vor before_id liegen."})
+
     @action(detail=True, methods=["get", "post"], url_path="comments")
     def comments(self, request, pk=None):
         task = self.get_object()
         if request.method == "GET":
-            serializer = CommentSerializer(task.comments.all(), many=True)
-            return Response(serializer.data)
+            page = self.paginate_queryset(task.comments.select_related("author"))
+            serializer = CommentSerializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
         elif request.method == "POST":
             serializer = CommentSerializer(data=request.data)
             if serializer.is_valid():
@@ -79,14 +143,32 @@ class TaskViewSet(viewsets.ModelViewSet):
         comment.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
+    @action(detail=False, methods=["get"], url_path="search", pagination_class=SearchPagination)
+    def search(self, request):
+        match = match_expression(request.query_params.get("q", ""))
+        if not match:
+            raise ValidationError({"q": "Bitte einen Suchbegriff angeben."})
+        tasks = Task.objects.visible_to(request.user).search(match).for_response()
+        serializer = TaskResponseSerializer(self.paginate_queryset(tasks), many=True)
+        return self.get_paginated_response(serializer.data)
+
     @action(detail=False, methods=["get"], url_path="assigned-to-me")
     def assigned_to_me(self, request):
-        tasks = Task.objects.filter(assignee=request.user)
-        serializer = TaskResponseSerializer(tasks, many=True)
-        return Response(serializer.data)
+        tasks = self.filter_queryset(Task.objects.filter(assignee=request.user).on_alive_boards().for_response())
+        serializer = TaskResponseSerializer(self.paginate_queryset(tasks), many=True)
+        return self.get_paginated_response(serializer.data)
     
     @action(detail=False, methods=["get"], url_path="reviewing")
     def reviewing(self, request):
-        tasks = Task.objects.filter(reviewer=request.user)
-        serializer = self.get_serializer(tasks, many=True)
-        return Response(serializer.data)
+        tasks = self.filter_queryset(Task.objects.filter(reviewer=request.user).on_alive_boards().for_response())
+        serializer = self.get_serializer(self.paginate_queryset(tasks), many=True)
+        return self.get_paginated_response(serializer.data)
+
+
+def task_list_versions(user):
+    """``(pk, version)`` of every board that contributes tasks to the user's task list."""
+    own_tasks = Task.objects.filter(Q(assignee=user) | Q(created_by=user)).values("board_id")
+    boards = Board.objects.alive().filter(
+        Q(pk__in=Board.objects.visible_to(user).values("pk")) | Q(pk__in=own_tasks)
+    )
+    return boards.order_by("pk").values_list("pk", "version")
@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from tasks_app.models import Task
+
+
+class Command(BaseCommand):
+    help = "Re-space the card rank keys of board columns whose keys have grown too long."
+
+    def add_arguments(self, parser):
+        parser.add_argument("board_ids", nargs="*", type=int, help="Only rebalance these boards.")
+        parser.add_argument(
+            "--max-length", type=int, default=settings.TASK_RANK_MAX_LENGTH,
+            help="Rebalance columns holding a key longer than this; 0 rebalances every column.",
+        )
+
+    def handle(self, *args, **options):
+        tasks = Task.objects.all()
+        if options["board_ids"]:
+            tasks = tasks.filter(board_id__in=options["board_ids"])
+        columns = tasks.long_rank_columns(options["max_length"])
+        rebalanced = Task.objects.rebalance(sorted(columns))
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebalanced {len(columns)} column(s) with {rebalanced} card(s)."
+        ))
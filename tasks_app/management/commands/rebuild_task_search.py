@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from tasks_app.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index over tasks and comments from scratch."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default="default", help="Database alias to rebuild.")
+
+    def handle(self, *args, **options):
+        indexed = rebuild_search_index(options["database"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt the task search index, {indexed} task(s) indexed."))
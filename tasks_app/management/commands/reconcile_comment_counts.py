@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from tasks_app.models import Task
+
+
+class Command(BaseCommand):
+    help = "Recount the denormalized comment count of every task and repair any drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument("board_ids", nargs="*", type=int, help="Only reconcile tasks on these boards.")
+
+    def handle(self, *args, **options):
+        drifted = Task.objects.recount_comments(options["board_ids"] or None)
+        self.stdout.write(self.style.SUCCESS(f"Reconciled comment counts, {drifted} task(s) had drifted."))
@@ -0,0 +1,107 @@
+# Generated by Django 5.2.5 on 2026-10-18 20:42
+
+import django.db.models.deletion
+import tasks_app.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks_app', '0005_keyset_pagination_indexes'),
+    ]
+
+    # FTS5 index over tasks and comments, see tasks_app.search. bm25 weighs a
+    # hit in the title 10x and in the description 4x a hit in a comment. The
+    # comment triggers append on insert and re-join the task's comments on
+    # update and delete.
+    operations = [
+        migrations.CreateModel(
+            name='TaskSearch',
+            fields=[
+                ('task', models.OneToOneField(db_column='rowid', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search', serialize=False, to='tasks_app.task')),
+                ('title', models.TextField()),
+                ('description', models.TextField()),
+                ('comments', models.TextField()),
+                ('document', tasks_app.models.SearchDocument(db_column='tasks_app_task_search')),
+                ('rank', models.FloatField()),
+            ],
+            options={
+                'db_table': 'tasks_app_task_search',
+                'managed': False,
+            },
+        ),
+        migrations.RunSQL(
+            sql=[
+                """
+                CREATE VIRTUAL TABLE tasks_app_task_search USING fts5(
+                    title, description, comments, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+                )
+                """,
+                "INSERT INTO tasks_app_task_search (tasks_app_task_search, rank) VALUES ('rank', 'bm25(10.0, 4.0, 1.0)')",
+            ],
+            reverse_sql="DROP TABLE tasks_app_task_search",
+        ),
+        migrations.RunSQL(
+            sql=[
+                """
+                CREATE TRIGGER tasks_app_task_search_insert AFTER INSERT ON tasks_app_task BEGIN
+                    INSERT INTO tasks_app_task_search (rowid, title, description, comments)
+                    VALUES (new.id, new.title, COALESCE(new.description, ''), '');
+                END
+                """,
+                """
+                CREATE TRIGGER tasks_app_task_search_update AFTER UPDATE OF title, description ON tasks_app_task
+                WHEN old.title IS NOT new.title OR old.description IS NOT new.description BEGIN
+                    UPDATE tasks_app_task_search SET title = new.title, description = COALESCE(new.description, '')
+                    WHERE rowid = new.id;
+                END
+                """,
+                """
+                CREATE TRIGGER tasks_app_task_search_delete AFTER DELETE ON tasks_app_task BEGIN
+                    DELETE FROM tasks_app_task_search WHERE rowid = old.id;
+                END
+                """,
+                """
+                CREATE TRIGGER tasks_app_comment_search_insert AFTER INSERT ON tasks_app_comment BEGIN
+                    UPDATE tasks_app_task_search SET comments = comments || ' ' || new.content
+                    WHERE rowid = new.task_id;
+                END
+                """,
+                """
+                CREATE TRIGGER tasks_app_comment_search_update AFTER UPDATE OF content, task_id ON tasks_app_comment
+                WHEN old.content IS NOT new.content OR old.task_id IS NOT new.task_id BEGIN
+                    UPDATE tasks_app_task_search SET comments = COALESCE(
+                        (SELECT group_concat(content, ' ') FROM tasks_app_comment WHERE task_id = tasks_app_task_search.rowid), ''
+                    ) WHERE rowid IN (old.task_id, new.task_id);
+                END
+                """,
+                """
+                CREATE TRIGGER tasks_app_comment_search_delete AFTER DELETE ON tasks_app_comment BEGIN
+                    UPDATE tasks_app_task_search SET comments = COALESCE(
+                        (SELECT group_concat(content, ' ') FROM tasks_app_comment WHERE task_id = old.task_id), ''
+                    ) WHERE rowid = old.task_id;
+                END
+                """,
+            ],
+            reverse_sql=[
+                "DROP TRIGGER tasks_app_task_search_insert",
+                "DROP TRIGGER tasks_app_task_search_update",
+                "DROP TRIGGER tasks_app_task_search_delete",
+                "DROP TRIGGER tasks_app_comment_search_insert",
+                "DROP TRIGGER tasks_app_comment_search_update",
+                "DROP TRIGGER tasks_app_comment_search_delete",
+            ],
+        ),
+        migrations.RunSQL(
+            sql=[
+                """
+                INSERT INTO tasks_app_task_search (rowid, title, description, comments)
+                SELECT t.id, t.title, COALESCE(t.description, ''),
+                       COALESCE((SELECT group_concat(c.content, ' ') FROM tasks_app_comment c WHERE c.task_id = t.id), '')
+                FROM tasks_app_task t
+                """,
+            ],
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.5 on 2026-10-18 20:50
+
+from django.conf import settings
+from django.db import migrations, models
+
+from tasks_app.ranking import spread
+
+
+def rank_existing_tasks(apps, schema_editor):
+    """Spread keys over every column in creation order."""
+    Task = apps.get_model('tasks_app', 'Task')
+    columns = Task.objects.values_list('board_id', 'status').distinct()
+    for board_id, status in columns:
+        tasks = list(Task.objects.filter(board_id=board_id, status=status).only('id').order_by('created_at', 'id'))
+        for task, rank in zip(tasks, spread(len(tasks))):
+            task.rank = rank
+        Task.objects.bulk_update(tasks, ['rank'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('boards_app', '0006_boardchange'),
+        ('tasks_app', '0007_task_filter_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='rank',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['board', 'status', 'rank'], name='task_column_rank_idx'),
+        ),
+        migrations.RunPython(rank_existing_tasks, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.5 on 2026-10-18 20:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks_app', '0008_task_rank'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='comments_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunSQL(
+            sql="""
+                UPDATE tasks_app_task SET comments_count = (
+                    SELECT COUNT(*) FROM tasks_app_comment WHERE tasks_app_comment.task_id = tasks_app_task.id
+                )
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,37 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks_app', '0009_task_comments_count'),
+    ]
+
+    # Bulk deletes drop a task's search row before its comments (see
+    # TaskQuerySet.delete_with_comments); the comment delete trigger then
+    # skips re-joining the remaining comments once per deleted comment.
+    operations = [
+        migrations.RunSQL(
+            sql=[
+                "DROP TRIGGER IF EXISTS tasks_app_comment_search_delete",
+                """
+                CREATE TRIGGER tasks_app_comment_search_delete AFTER DELETE ON tasks_app_comment
+                WHEN EXISTS (SELECT 1 FROM tasks_app_task_search WHERE rowid = old.task_id) BEGIN
+                    UPDATE tasks_app_task_search SET comments = COALESCE(
+                        (SELECT group_concat(content, ' ') FROM tasks_app_comment WHERE task_id = old.task_id), ''
+                    ) WHERE rowid = old.task_id;
+                END
+                """,
+            ],
+            reverse_sql=[
+                "DROP TRIGGER IF EXISTS tasks_app_comment_search_delete",
+                """
+                CREATE TRIGGER tasks_app_comment_search_delete AFTER DELETE ON tasks_app_comment BEGIN
+                    UPDATE tasks_app_task_search SET comments = COALESCE(
+                        (SELECT group_concat(content, ' ') FROM tasks_app_comment WHERE task_id = old.task_id), ''
+                    ) WHERE rowid = old.task_id;
+                END
+                """,
+            ],
+        ),
+    ]
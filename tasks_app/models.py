@@ -1,6 +1,116 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, F, Max, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce, Length
 from django.conf import settings
 from boards_app.models import Board
+from tasks_app import ranking
+
+
+class TaskQuerySet(models.QuerySet):
+
+    def visible_to(self, user):
+        boards = Board.objects.visible_to(user).values("pk")
+        return self.filter(Q(board__in=boards) | Q(assignee=user) | Q(created_by=user)).on_alive_boards()
+
+    def on_alive_boards(self):
+        # board_id NOT IN the (few) soft-deleted boards: no join to board, so
+        # SQLite keeps resolving the visibility OR from the task indexes.
+        return self.exclude(board__in=Board.objects.deleted().values("pk"))
+
+    def for_response(self):
+        return self.select_related("assignee", "reviewer")
+
+    def delete_with_comments(self):
+        """DELETE the tasks and their comments with set-based statements.
+
+        The tasks' search rows go first, so the comment trigger has nothing
+        to re-join. Skips the collector: rows are not loaded and no per-row
+        post_delete fires, so callers account for stats, versions and the
+        change feed.
+        """
+        TaskSearch.objects.filter(task__in=self.values("pk"))._raw_delete(self.db)
+        Comment.objects.filter(task__in=self.values("pk"))._raw_delete(self.db)
+        return self._raw_delete(self.db)
+
+    def recount_comments(self, board_ids=None):
+        """Repair ``comments_count`` drift; return the number of tasks corrected."""
+        counted = (
+            Comment.objects
+            .filter(task_id=OuterRef("pk"))
+            .order_by()
+            .values("task_id")
+            .annotate(count=Count("pk"))
+            .values("count")
+        )
+        expected = Coalesce(Subquery(counted), 0)
+        tasks = self.all() if board_ids is None else self.filter(board_id__in=board_ids)
+        return tasks.filter(~Q(comments_count=expected)).update(comments_count=expected)
+
+    def place_last(self, tasks):
+        """Give ``tasks`` rank keys at the end of their (board, status) columns, in list order."""
+        last = {
+            (board_id, status): rank
+            for board_id, status, rank in self.filter(
+                board_id__in={task.board_id for task in tasks}, status__in={task.status for task in tasks}
+            ).values("board_id", "status").annotate(last=Max("rank")).values_list("board_id", "status", "last")
+        }
+        for task in tasks:
+            column = (task.board_id, task.status)
+            task.rank = last[column] = ranking.rank_between(last.get(column) or None, None)
+
+    def rank_between_cards(self, after_id=None, before_id=None):
+        """Rank key for a card placed right after ``after_id`` and/or right
+        before ``before_id`` in this column queryset; with neither, at its end.
+
+        Raises DoesNotExist for a neighbour outside the column and ValueError
+        when the neighbours' keys leave no room in between.
+        """
+        column = self.order_by("rank", "id")
+        neighbours = [pk for pk in (after_id, before_id) if pk is not None]
+        ranks = dict(column.filter(pk__in=neighbours).values_list("pk", "rank")) if neighbours else {}
+        if len(ranks) < len(neighbours):
+            raise self.model.DoesNotExist("Neighbour card is not in this column.")
+        lower, upper = ranks.get(after_id), ranks.get(before_id)
+        if after_id is not None and before_id is None:
+            upper = column.filter(
+                Q(rank__gt=lower) | Q(rank=lower, pk__gt=after_id)
+            ).values_list("rank", flat=True).first()
+        elif before_id is not None and after_id is None:
+            lower = column.filter(
+                Q(rank__lt=upper) | Q(rank=upper, pk__lt=before_id)
+            ).values_list("rank", flat=True).last()
+        elif not neighbours:
+            lower = column.values_list("rank", flat=True).last()
+        return ranking.rank_between(lower or None, upper)
+
+    def long_rank_columns(self, max_length):
+        """(board_id, status) of the columns holding a key longer than ``max_length``."""
+        return set(
+            self.annotate(rank_length=Length("rank")).filter(rank_length__gt=max_length)
+            .values_list("board_id", "status").distinct()
+        )
+
+    def rebalance(self, columns):
+        """Re-space the keys of each (board_id, status) column evenly, keeping the card order."""
+        from .signals import tasks_bulk_saved
+
+        updated = []
+        with transaction.atomic():
+            for board_id, status in columns:
+                tasks = list(
+                    self.filter(board_id=board_id, status=status)
+                    .only("board_id", "status", "priority", "rank").order_by("rank", "id")
+                )
+                for task, rank in zip(tasks, ranking.spread(len(tasks))):
+                    task.rank = rank
+                self.bulk_update(tasks, ["rank"], batch_size=500)
+                updated += [(task, task.stats_key()) for task in tasks]
+            tasks_bulk_saved.send(sender=self.model, created=[], updated=updated)
+        return len(updated)
+
+    def search(self, match):
+        """Tasks matching the FTS5 query ``match``, annotated with their bm25 ``search_rank``."""
+        return self.filter(search__document__match=match).annotate(search_rank=F("search__rank"))
 
 
 class Task(models.Model):
@@ -39,13 +149,60 @@ class Task(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="to-do")
     priority = models.CharField(max_length=20, choices=PRIORITY_CHOICES, default="medium")
     due_date = models.DateField(null=True, blank=True)
+    # Position within the (board, status) column, see tasks_app.ranking.
+    rank = models.CharField(max_length=255, blank=True, default="")
+    # Kept up to date by the comment signals; reconcile_comment_counts repairs drift.
+    comments_count = models.PositiveIntegerField(default=0)
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = TaskQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="task_created_idx"),
+            models.Index(fields=["assignee", "created_at", "id"], name="task_assignee_created_idx"),
+            models.Index(fields=["reviewer", "created_at", "id"], name="task_reviewer_created_idx"),
+            # Task list filters (tasks_app.api.serializers.TaskFilterSerializer).
+            models.Index(fields=["board", "status", "created_at", "id"], name="task_board_status_idx"),
+            models.Index(fields=["board", "priority", "created_at", "id"], name="task_board_priority_idx"),
+            models.Index(fields=["assignee", "status", "created_at", "id"], name="task_assignee_status_idx"),
+            models.Index(fields=["reviewer", "status", "created_at", "id"], name="task_reviewer_status_idx"),
+            models.Index(fields=["due_date", "id"], name="task_due_date_idx"),
+            models.Index(fields=["board", "status", "rank"], name="task_column_rank_idx"),
+        ]
+
     def __str__(self):
         return f"{self.title} ({self.status})"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_stats = instance.stats_key()
+        instance._loaded_rank = instance.__dict__.get("rank")
+        return instance
+
+    def place(self, status, rank):
+        """Put the card into the ``status`` column at ``rank``; save() keeps the given rank."""
+        self.status, self.rank = status, rank
+        self._loaded_rank = None
+
+    def save(self, *args, **kwargs):
+        # New cards, and cards that change column without being given a new
+        # rank, go to the end of their column.
+        loaded = getattr(self, "_loaded_stats", None)
+        changed_column = loaded is not None and loaded[:2] != self.stats_key()[:2]
+        if not self.rank or (changed_column and self.rank == self._loaded_rank):
+            Task.objects.place_last([self])
+            if kwargs.get("update_fields") is not None:
+                kwargs["update_fields"] = {*kwargs["update_fields"], "rank"}
+        super().save(*args, **kwargs)
+        self._loaded_rank = self.rank
+
+    def stats_key(self):
+        return tuple(self.__dict__.get(field) for field in ("board_id", "status", "priority"))
+
 
 class Comment(models.Model):
     task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name="comments")
@@ -53,5 +210,45 @@ class Comment(models.Model):
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["task", "created_at", "id"], name="comment_task_created_idx"),
+        ]
+
     def __str__(self):
         return f"Comment by {self.author} on {self.task.title}"
+
+
+class SearchDocument(models.TextField):
+    """Hidden FTS5 column named after its table; matching it searches all columns."""
+
+
+@SearchDocument.register_lookup
+class Match(models.Lookup):
+    lookup_name = "match"
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs} MATCH {rhs}", (*lhs_params, *rhs_params)
+
+
+class TaskSearch(models.Model):
+    """FTS5 index over task titles, descriptions and comments, one row per task.
+
+    The table and the triggers that keep it in sync live in migration 0006,
+    ``python manage.py rebuild_task_search`` refills it.
+    """
+    task = models.OneToOneField(
+        Task, primary_key=True, db_column="rowid", db_constraint=False,
+        on_delete=models.DO_NOTHING, related_name="search"
+    )
+    title = models.TextField()
+    description = models.TextField()
+    comments = models.TextField()
+    document = SearchDocument(db_column="tasks_app_task_search")
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = "tasks_app_task_search"
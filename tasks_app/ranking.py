@@ -0,0 +1,105 @@
+"""Fractional rank keys that order the cards of a board column.
+
+A key is a base-62 fraction written without the leading "0.", e.g. "V" is
+31/62. Keys compare correctly as plain strings (SQLite's BINARY collation),
+and a key strictly between any two others always exists, so moving a card
+rewrites only that card. Keys never end in "0", which keeps them unique per
+value. Repeated inserts at the same spot make keys longer; rebalancing
+re-spaces a column with short, evenly distributed keys.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connections, transaction
+
+DIGITS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+BASE = len(DIGITS)
+
+logger = logging.getLogger(__name__)
+
+rebalance_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rank-rebalance")
+
+
+def rank_between(lower=None, upper=None):
+    """A key strictly between ``lower`` and ``upper``; None means the column's start or end."""
+    if upper is not None and not (lower or "") < upper:
+        raise ValueError(f"{lower!r} does not sort before {upper!r}")
+    if upper is None:
+        return rank_after(lower or "")
+    if lower is None:
+        return rank_before(upper)
+    return midpoint(lower, upper)
+
+
+# Appending and prepending step the first digit that has room instead of
+# halving the distance to the column's end, so a key grows by one character
+# only every ~60 cards added at the same end.
+
+def rank_after(key):
+    for index, char in enumerate(key):
+        if char != DIGITS[-1]:
+            return key[:index] + DIGITS[DIGITS.index(char) + 1]
+    return key + DIGITS[BASE // 2]
+
+
+def rank_before(key):
+    for index, char in enumerate(key):
+        if char > DIGITS[1]:
+            return key[:index] + DIGITS[DIGITS.index(char) - 1]
+    return midpoint("", key)
+
+
+def midpoint(lower, upper):
+    """A key between ``lower`` ("" is 0) and ``upper`` (None is 1)."""
+    if upper is not None:
+        prefix = 0
+        while prefix < len(upper) and (lower[prefix] if prefix < len(lower) else DIGITS[0]) == upper[prefix]:
+            prefix += 1
+        if prefix:
+            return upper[:prefix] + midpoint(lower[prefix:], upper[prefix:])
+    low = DIGITS.index(lower[0]) if lower else 0
+    high = DIGITS.index(upper[0]) if upper is not None else BASE
+    if high - low > 1:
+        return DIGITS[(low + high) // 2]
+    if upper is not None and len(upper) > 1:
+        return upper[0]
+    return DIGITS[low] + midpoint(lower[1:], None)
+
+
+def spread(count):
+    """``count`` ascending keys spaced evenly over the whole range, all of the same short length."""
+    width = 1
+    while BASE ** width <= count:
+        width += 1
+    step = BASE ** width // (count + 1)
+    keys = []
+    for position in range(1, count + 1):
+        value, digits = position * step, []
+        for _ in range(width):
+            value, digit = divmod(value, BASE)
+            digits.append(DIGITS[digit])
+        keys.append("".join(reversed(digits)).rstrip(DIGITS[0]))
+    return keys
+
+
+def needs_rebalance(key):
+    return len(key) > settings.TASK_RANK_MAX_LENGTH
+
+
+def schedule_rebalance(board_id, status):
+    """Re-space the column's keys on a background thread once the transaction commits."""
+    transaction.on_commit(lambda: rebalance_pool.submit(rebalance_column, board_id, status))
+
+
+def rebalance_column(board_id, status):
+    from tasks_app.models import Task
+
+    try:
+        column = Task.objects.filter(board_id=board_id, status=status)
+        if column.long_rank_columns(settings.TASK_RANK_MAX_LENGTH):
+            Task.objects.rebalance([(board_id, status)])
+    except Exception:
+        logger.exception("Rebalancing ranks of board %s, column %s failed", board_id, status)
+    finally:
+        connections.close_all()
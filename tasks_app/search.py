@@ -0,0 +1,104 @@
+"""Full-text search over tasks and their comments (SQLite FTS5).
+
+``tasks_app_task_search`` holds one row per task (rowid = task id) with the
+title, description and the task's comments joined into one column. Triggers
+on the task and comment tables keep it in sync on every write, including
+bulk_create, queryset updates and raw deletes that skip Django's signals.
+
+Re-joining a task's comments on every comment DELETE is quadratic when all of
+them go at once, so bulk deletes remove the task's row first (see
+``TaskQuerySet.delete_with_comments``); the trigger skips tasks without one.
+"""
+import re
+
+from django.db import connections
+
+MAX_TERMS = 8
+
+# Same triggers as migrations 0006 and 0010. SQLite drops a table's triggers whenever a
+# migration rebuilds the table (most AddField/AlterField), so they are
+# recreated after every migrate.
+TRIGGERS_SQL = [
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_app_task_search_insert AFTER INSERT ON tasks_app_task BEGIN
+        INSERT INTO tasks_app_task_search (rowid, title, description, comments)
+        VALUES (new.id, new.title, COALESCE(new.description, ''), '');
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_app_task_search_update AFTER UPDATE OF title, description ON tasks_app_task
+    WHEN old.title IS NOT new.title OR old.description IS NOT new.description BEGIN
+        UPDATE tasks_app_task_search SET title = new.title, description = COALESCE(new.description, '')
+        WHERE rowid = new.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_app_task_search_delete AFTER DELETE ON tasks_app_task BEGIN
+        DELETE FROM tasks_app_task_search WHERE rowid = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_app_comment_search_insert AFTER INSERT ON tasks_app_comment BEGIN
+        UPDATE tasks_app_task_search SET comments = comments || ' ' || new.content
+        WHERE rowid = new.task_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_app_comment_search_update AFTER UPDATE OF content, task_id ON tasks_app_comment
+    WHEN old.content IS NOT new.content OR old.task_id IS NOT new.task_id BEGIN
+        UPDATE tasks_app_task_search SET comments = COALESCE(
+            (SELECT group_concat(content, ' ') FROM tasks_app_comment WHERE task_id = tasks_app_task_search.rowid), ''
+        ) WHERE rowid IN (old.task_id, new.task_id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_app_comment_search_delete AFTER DELETE ON tasks_app_comment
+    WHEN EXISTS (SELECT 1 FROM tasks_app_task_search WHERE rowid = old.task_id) BEGIN
+        UPDATE tasks_app_task_search SET comments = COALESCE(
+            (SELECT group_concat(content, ' ') FROM tasks_app_comment WHERE task_id = old.task_id), ''
+        ) WHERE rowid = old.task_id;
+    END
+    """,
+]
+
+REBUILD_SQL = [
+    "DELETE FROM tasks_app_task_search",
+    """
+    INSERT INTO tasks_app_task_search (rowid, title, description, comments)
+    SELECT t.id, t.title, COALESCE(t.description, ''),
+           COALESCE((SELECT group_concat(c.content, ' ') FROM tasks_app_comment c WHERE c.task_id = t.id), '')
+    FROM tasks_app_task t
+    """,
+    "INSERT INTO tasks_app_task_search (tasks_app_task_search) VALUES ('optimize')",
+]
+
+
+def match_expression(text):
+    """FTS5 query for free text: every word has to occur, longer words as prefixes.
+
+    Words are quoted, so FTS5 syntax in the input (quotes, -, OR, NEAR, column
+    filters) is searched literally instead of raising a syntax error.
+    Single characters are matched exactly, the prefix index starts at two.
+    """
+    terms = re.findall(r"\w+", text)[:MAX_TERMS]
+    return " ".join(f'"{term}"*' if len(term) > 1 else f'"{term}"' for term in terms)
+
+
+def create_search_triggers(using="default"):
+    """Create missing sync triggers; a no-op until migration 0006 created the index."""
+    connection = connections[using]
+    if "tasks_app_task_search" not in connection.introspection.table_names():
+        return
+    with connection.cursor() as cursor:
+        for statement in TRIGGERS_SQL:
+            cursor.execute(statement)
+
+
+def rebuild_search_index(using="default"):
+    """Refill the index from the task and comment tables; return the number of tasks indexed."""
+    create_search_triggers(using)
+    with connections[using].cursor() as cursor:
+        for statement in REBUILD_SQL:
+            cursor.execute(statement)
+        cursor.execute("SELECT count(*) FROM tasks_app_task_search")
+        return cursor.fetchone()[0]
@@ -0,0 +1,100 @@
+from django.db.models import F, QuerySet
+from django.db.models.signals import post_delete, post_migrate, post_save
+from django.dispatch import Signal, receiver
+
+from boards_app.models import Board, BoardChange, BoardStats
+from .models import Comment, Task
+from .ranking import needs_rebalance, schedule_rebalance
+from .search import create_search_triggers
+
+# Sent after bulk_create/bulk_update writes and set-based deletes, which bypass
+# post_save/post_delete. ``created`` and ``deleted`` are lists of tasks,
+# ``updated`` a list of (task, previous stats_key()).
+tasks_bulk_saved = Signal()
+
+
+def deleted_with_task(origin):
+    """Whether a comment deletion cascades from deleting its task (or board)."""
+    if origin is None:
+        return False
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return issubclass(model, (Task, Board))
+
+
+def comment_board_id(comment):
+    if Comment.task.is_cached(comment):
+        return comment.task.board_id
+    return Task.objects.filter(pk=comment.task_id).values_list("board_id", flat=True).first()
+
+
+@receiver(post_save, sender=Task)
+def task_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    previous = None if created else getattr(instance, "_loaded_stats", None)
+    current = instance.stats_key()
+    if created or previous is not None:
+        BoardStats.objects.apply_task_changes([(previous, current)])
+    Board.objects.bump_version([instance.board_id, previous and previous[0]])
+    BoardChange.objects.record(instance.board_id, "task", [instance.pk], "upsert")
+    if previous and previous[0] != instance.board_id:
+        BoardChange.objects.record(previous[0], "task", [instance.pk], "delete")
+    if needs_rebalance(instance.rank):
+        schedule_rebalance(instance.board_id, instance.status)
+    instance._loaded_stats = current
+
+
+@receiver(post_delete, sender=Task)
+def task_deleted(sender, instance, **kwargs):
+    previous = getattr(instance, "_loaded_stats", None) or instance.stats_key()
+    BoardStats.objects.apply_task_changes([(previous, None)])
+    Board.objects.bump_version([instance.board_id])
+    BoardChange.objects.record(instance.board_id, "task", [instance.pk], "delete")
+
+
+@receiver(tasks_bulk_saved, sender=Task)
+def tasks_bulk_saved_handler(sender, created, updated, deleted=(), **kwargs):
+    changes = [(None, task.stats_key()) for task in created]
+    changes += [(previous, task.stats_key()) for task, previous in updated]
+    changes += [(task.stats_key(), None) for task in deleted]
+    BoardStats.objects.apply_task_changes(changes)
+    Board.objects.bump_version({key[0] for change in changes for key in change if key})
+    entries, long_columns = [], set()
+    for task, previous in [(task, None) for task in created] + updated:
+        entries.append((task.board_id, "task", task.pk, "upsert"))
+        if previous and previous[0] != task.board_id:
+            entries.append((previous[0], "task", task.pk, "delete"))
+        if needs_rebalance(task.rank):
+            long_columns.add((task.board_id, task.status))
+        task._loaded_stats = task.stats_key()
+    entries += [(task.board_id, "task", task.pk, "delete") for task in deleted]
+    BoardChange.objects.record_many(entries)
+    for board_id, status in long_columns:
+        schedule_rebalance(board_id, status)
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, created=False, raw=False, **kwargs):
+    if not raw:
+        if created:
+            Task.objects.filter(pk=instance.task_id).update(comments_count=F("comments_count") + 1)
+        board_id = comment_board_id(instance)
+        Board.objects.bump_version([board_id], lists=False)
+        BoardChange.objects.record(board_id, "comment", [instance.pk], "upsert")
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, origin=None, **kwargs):
+    if deleted_with_task(origin):
+        # The task's own delete entry covers its comments.
+        return
+    Task.objects.filter(pk=instance.task_id).update(comments_count=F("comments_count") - 1)
+    board_id = comment_board_id(instance)
+    Board.objects.bump_version([board_id], lists=False)
+    BoardChange.objects.record(board_id, "comment", [instance.pk], "delete")
+
+
+@receiver(post_migrate)
+def restore_search_triggers(sender, using, **kwargs):
+    if sender.label == "tasks_app":
+        create_search_triggers(using)
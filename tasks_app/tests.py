@@ -1,3 +1,420 @@
-from django.test import TestCase
+import base64
+import datetime
+import json
 
-# Create your tests here.
+from django.db import connection
+from rest_framework import status
+
+from benchmarks.testing import SeededAPITestCase
+from boards_app.models import BoardStats
+from tasks_app.api.serializers import TaskFilterSerializer
+from tasks_app.models import Comment, Task, TaskSearch
+
+
+class TaskQueryBudgetTests(SeededAPITestCase):
+    """Query counts per task and comment endpoint on cold caches.
+
+    Every page holds many tasks or comments, so a per-row query in
+    TaskResponseSerializer or CommentSerializer fails the budget.
+    """
+
+    def setUp(self):
+        super().setUp()
+        Task.objects.filter(pk__in=[task.pk for task in self.data["tasks"][::2]]).update(
+            assignee=self.user, reviewer=self.user
+        )
+
+    def test_list(self):
+        with self.assertNumQueries(3):
+            response = self.client.get("/api/tasks/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 50)
+
+    def test_list_next_page(self):
+        next_url = self.client.get("/api/tasks/?page_size=20").data["next"]
+        with self.assertNumQueries(2):
+            response = self.client.get(next_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 20)
+
+    def test_list_not_modified(self):
+        etag = self.client.get("/api/tasks/")["ETag"]
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/tasks/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_assigned_to_me(self):
+        with self.assertNumQueries(2):
+            response = self.client.get("/api/tasks/assigned-to-me/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertGreater(len(response.data["results"]), 1)
+
+    def test_reviewing(self):
+        with self.assertNumQueries(2):
+            response = self.client.get("/api/tasks/reviewing/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertGreater(len(response.data["results"]), 1)
+
+    def test_detail(self):
+        with self.assertNumQueries(3):
+            response = self.client.get(f"/api/tasks/{self.task.pk}/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_create(self):
+        # One query for the end of the card's column.
+        with self.assertNumQueries(9):
+            response = self.client.post("/api/tasks/", {"board": self.board.pk, "title": "Neu"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_update(self):
+        with self.assertNumQueries(7):
+            response = self.client.patch(f"/api/tasks/{self.task.pk}/", {"status": "review"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_delete(self):
+        # Comments cascade without per-comment signal work.
+        self.assertGreater(self.task.comments.count(), 1)
+        with self.assertNumQueries(11):
+            response = self.client.delete(f"/api/tasks/{self.task.pk}/")
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+    def test_bulk_create(self):
+        operations = [{"op": "create", "data": {"board": self.board.pk, "title": f"Bulk {i}"}} for i in range(20)]
+        with self.assertNumQueries(11):
+            response = self.client.post("/api/tasks/bulk/", {"operations": operations}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 20)
+
+    def test_bulk_update(self):
+        tasks = list(self.board.tasks.order_by("pk")[:15])
+        operations = [{"op": "update", "id": task.pk, "data": {"status": "done"}} for task in tasks]
+        with self.assertNumQueries(12) as queries:
+            response = self.client.post("/api/tasks/bulk/", {"operations": operations}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # The tasks are loaded inside the transaction that writes them back.
+        sql = [query["sql"] for query in queries.captured_queries]
+        self.assertLess(
+            next(i for i, text in enumerate(sql) if text.startswith("SAVEPOINT")),
+            next(i for i, text in enumerate(sql) if text.startswith('SELECT "tasks_app_task"')),
+        )
+        self.assertEqual(BoardStats.objects.recount([self.board.pk]), 0)
+
+    def test_bulk_delete(self):
+        # Three set-based DELETEs (search rows, comments, tasks), then stats,
+        # version and change feed once for the batch.
+        tasks = list(self.board.tasks.order_by("pk")[:15])
+        operations = [{"op": "delete", "id": task.pk} for task in tasks]
+        with self.assertNumQueries(12):
+            response = self.client.post("/api/tasks/bulk/", {"operations": operations}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(Task.objects.filter(pk__in=[task.pk for task in tasks]).exists())
+        self.assertFalse(Comment.objects.filter(task_id__in=[task.pk for task in tasks]).exists())
+        self.assertEqual(BoardStats.objects.recount([self.board.pk]), 0)
+        self.assertEqual(
+            set(self.board.changes.filter(kind="task", action="delete").values_list("object_id", flat=True)),
+            {task.pk for task in tasks},
+        )
+
+    def test_bulk_invalid_references(self):
+        operations = [
+            {"op": "create", "data": {"board": "abc", "title": "x"}},
+            {"op": "create", "data": {"board": [1], "title": "x"}},
+            {"op": "create", "data": {"board": self.board.pk, "title": "x", "assignee_id": "zz"}},
+            {"op": "update", "id": self.task.pk, "data": {"reviewer_id": {"id": 1}}},
+        ]
+        response = self.client.post("/api/tasks/bulk/", {"operations": operations}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertTrue(all(result["status"] == 400 for result in response.data["results"]))
+
+    def test_move(self):
+        column = list(self.board.tasks.filter(status=self.task.status).exclude(pk=self.task.pk).order_by("rank", "id"))
+        with self.assertNumQueries(11):
+            response = self.client.post(
+                f"/api/tasks/{self.task.pk}/move/", {"after_id": column[0].pk, "before_id": column[1].pk}, format="json"
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(column[0].rank < response.data["rank"] < column[1].rank)
+
+    def test_comments(self):
+        with self.assertNumQueries(4):
+            response = self.client.get(f"/api/tasks/{self.task.pk}/comments/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), self.task.comments.count())
+
+    def test_create_comment(self):
+        # One UPDATE for Task.comments_count.
+        with self.assertNumQueries(7):
+            response = self.client.post(f"/api/tasks/{self.task.pk}/comments/", {"content": "Hallo"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_delete_comment(self):
+        comment = Comment.objects.create(task=self.task, author=self.user, content="Weg")
+        with self.assertNumQueries(9):
+            response = self.client.delete(f"/api/tasks/{self.task.pk}/comments/{comment.pk}/")
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+    def test_search(self):
+        hidden = Task.objects.exclude(pk__in=Task.objects.visible_to(self.user).values("pk")).first()
+        Task.objects.filter(pk__in=[self.task.pk, hidden.pk]).update(title="Xylophon stimmen")
+        Comment.objects.create(task=self.data["tasks"][1], author=self.user, content="Xylophon fehlt")
+        with self.assertNumQueries(2):
+            response = self.client.get("/api/tasks/search/", {"q": "xylo"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # Title hits outrank comment hits; tasks on foreign boards stay hidden.
+        self.assertEqual([task["id"] for task in response.data["results"]], [self.task.pk, self.data["tasks"][1].pk])
+
+    def test_search_without_terms(self):
+        response = self.client.get("/api/tasks/search/", {"q": " -\" "})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_search_index_follows_deletes(self):
+        Comment.objects.create(task=self.task, author=self.user, content="Xylophon")
+        Comment.objects.create(task=self.task, author=self.user, content="Zither")
+        # One comment: the trigger re-joins the remaining ones.
+        Comment.objects.get(content="Xylophon").delete()
+        self.assertFalse(Task.objects.search('"xylophon"').exists())
+        self.assertEqual(list(Task.objects.search('"zither"').values_list("pk", flat=True)), [self.task.pk])
+        # In bulk: the task's row goes first and the comment trigger skips it.
+        Task.objects.filter(pk=self.task.pk).delete_with_comments()
+        self.assertFalse(TaskSearch.objects.filter(pk=self.task.pk).exists())
+        self.assertFalse(Comment.objects.filter(task_id=self.task.pk).exists())
+
+
+def query_plan(queryset):
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        return [row[3] for row in cursor.fetchall()]
+
+
+class CommentCountTests(SeededAPITestCase):
+    """Task.comments_count follows every way comments come and go."""
+
+    def comments_count(self, task):
+        return Task.objects.values_list("comments_count", flat=True).get(pk=task.pk)
+
+    def test_seeded_counts_match(self):
+        self.assertEqual(Task.objects.recount_comments(), 0)
+        self.assertEqual(self.comments_count(self.task), self.task.comments.count())
+
+    def test_create_and_delete(self):
+        before = self.comments_count(self.task)
+        response = self.client.post(f"/api/tasks/{self.task.pk}/comments/", {"content": "Hallo"}, format="json")
+        self.assertEqual(self.comments_count(self.task), before + 1)
+        self.client.delete(f"/api/tasks/{self.task.pk}/comments/{response.data['id']}/")
+        self.assertEqual(self.comments_count(self.task), before)
+
+    def test_author_deletion_cascades(self):
+        author = self.data["users"][-1]
+        tasks = list(
+            Task.objects.filter(comments__author=author).exclude(created_by=author).exclude(board__owner=author).distinct()
+        )
+        self.assertTrue(tasks)
+        author.delete()
+        for task in tasks:
+            self.assertEqual(self.comments_count(task), task.comments.count())
+
+    def test_reconcile_repairs_drift(self):
+        Task.objects.filter(pk=self.task.pk).update(comments_count=99)
+        self.assertEqual(Task.objects.recount_comments([self.board.pk]), 1)
+        self.assertEqual(self.comments_count(self.task), self.task.comments.count())
+
+
+class TaskFilterTests(SeededAPITestCase):
+    """Task list filters and orderings; each filter has to be an index range scan."""
+
+    def test_filters_use_indexes(self):
+        cases = [
+            (Task.objects.visible_to(self.user), {"status": "done"}, "task_board_status_idx (board_id=? AND status=?)"),
+            (Task.objects.visible_to(self.user), {"priority": "high"}, "task_board_priority_idx (board_id=? AND priority=?)"),
+            (Task.objects.all(), {"board": self.board.pk, "status": "done"}, "task_board_status_idx (board_id=? AND status=?)"),
+            (Task.objects.all(), {"board": self.board.pk, "priority": "low"}, "task_board_priority_idx (board_id=? AND priority=?)"),
+            (Task.objects.filter(assignee=self.user), {"status": "review"}, "task_assignee_status_idx (assignee_id=? AND status=?)"),
+            (Task.objects.filter(reviewer=self.user), {"status": "review"}, "task_reviewer_status_idx (reviewer_id=? AND status=?)"),
+            (Task.objects.all(), {"assignee": self.user.pk}, "(assignee_id=?)"),
+            (Task.objects.all(), {"reviewer": self.user.pk}, "(reviewer_id=?)"),
+            (Task.objects.all(), {"due_from": "2026-01-01", "due_to": "2026-01-31"}, "task_due_date_idx (due_date>? AND due_date<?)"),
+        ]
+        for tasks, params, search in cases:
+            with self.subTest(**params):
+                filters = TaskFilterSerializer(data=params)
+                filters.is_valid(raise_exception=True)
+                plan = query_plan(filters.filter(tasks))
+                self.assertTrue(any(search in step for step in plan), plan)
+                self.assertFalse(any(step.startswith("SCAN tasks_app_task") for step in plan), plan)
+
+    def test_filter_list(self):
+        response = self.client.get("/api/tasks/", {"board": self.board.pk, "status": "done", "priority": "high"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        expected = self.board.tasks.filter(status="done", priority="high").order_by("created_at", "id")
+        self.assertEqual([task["id"] for task in response.data["results"]], [task.pk for task in expected])
+
+    def test_invalid_filter(self):
+        response = self.client.get("/api/tasks/assigned-to-me/", {"due_from": "2026-02-01", "due_to": "2026-01-01"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("due_to", response.data)
+
+    def test_due_date_ordering_pages(self):
+        tasks = list(self.board.tasks.order_by("pk"))
+        for offset, task in enumerate(tasks[:8]):
+            task.due_date = datetime.date(2026, 3, 1) + datetime.timedelta(days=offset // 2)
+            task.save()
+        seen = []
+        url = f"/api/tasks/?board={self.board.pk}&ordering=due_date&page_size=3"
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            seen += [task["id"] for task in response.data["results"]]
+            url = response.data["next"]
+        # Dated tasks first in date order, tasks without due date last; id breaks ties.
+        self.assertEqual(seen, [task.pk for task in sorted(tasks, key=lambda task: (
+            task.due_date is None, task.due_date or datetime.date.min, task.pk
+        ))])
+
+
+class DeletedBoardTaskTests(SeededAPITestCase):
+    """Tasks of a soft-deleted (202) board leave every task list at once."""
+
+    def setUp(self):
+        super().setUp()
+        Task.objects.update(assignee=self.user, reviewer=self.user)
+        response = self.client.delete(f"/api/boards/{self.board.pk}/?deferred=true")
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.hidden = set(self.board.tasks.values_list("pk", flat=True))
+
+    def listed(self, response):
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        ids = {task["id"] for task in response.data["results"]}
+        self.assertTrue(ids)
+        return ids
+
+    def test_sync_lists(self):
+        for path in ["/api/tasks/", "/api/tasks/assigned-to-me/", "/api/tasks/reviewing/"]:
+            with self.subTest(path=path):
+                self.assertFalse(self.listed(self.client.get(path, {"page_size": 200})) & self.hidden)
+
+    async def test_async_lists(self):
+        headers = {"Authorization": f"Token {self.user.auth_token.key}"}
+        for path in ["/api/tasks/", "/api/tasks/assigned-to-me/", "/api/tasks/reviewing/"]:
+            with self.subTest(path=path):
+                response = await self.async_client.get(path, {"page_size": 200}, headers=headers)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                ids = {task["id"] for task in response.json()["results"]}
+                self.assertTrue(ids)
+                self.assertFalse(ids & self.hidden)
+
+    def test_visibility_stays_on_task_indexes(self):
+        # No join to board: the OR is resolved from the task indexes, not a table scan.
+        plan = query_plan(Task.objects.visible_to(self.user).order_by("created_at", "id"))
+        self.assertIn("MULTI-INDEX OR", plan)
+        self.assertFalse(any(step.startswith("SCAN tasks_app_task") for step in plan), plan)
+
+
+def encode_cursor(position):
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+
+class KeysetCursorTests(SeededAPITestCase):
+    """Tampered cursors are a 400 on the sync and the async task lists, never a 500."""
+    bad_cursors = [
+        "nicht-base64!",
+        encode_cursor({"created_at": "2026-01-01"}),
+        encode_cursor(["2026-01-01T00:00:00+00:00"]),
+        encode_cursor(["2026-01-01T00:00:00+00:00", "abc"]),
+        encode_cursor(["kein Datum", 1]),
+        encode_cursor([None, 1]),
+        encode_cursor([["2026-01-01"], 1]),
+        encode_cursor(["2026-01-01T00:00:00+00:00", True]),
+    ]
+
+    def test_sync_list(self):
+        for cursor in self.bad_cursors:
+            with self.subTest(cursor=cursor):
+                response = self.client.get("/api/tasks/", {"cursor": cursor})
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertIn("cursor", response.data)
+
+    def test_nullable_and_text_orderings(self):
+        cases = {"due_date": [None, "x"], "title": [{"a": 1}, 1], "-due_date": ["2026-13-40", 1]}
+        for ordering, position in cases.items():
+            with self.subTest(ordering=ordering):
+                response = self.client.get("/api/tasks/", {"ordering": ordering, "cursor": encode_cursor(position)})
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    async def test_async_lists(self):
+        headers = {"Authorization": f"Token {self.user.auth_token.key}"}
+        for path in ["/api/tasks/", "/api/tasks/assigned-to-me/", f"/api/tasks/{self.task.pk}/comments/"]:
+            for cursor in self.bad_cursors:
+                with self.subTest(path=path, cursor=cursor):
+                    response = await self.async_client.get(path, {"cursor": cursor}, headers=headers)
+                    self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                    self.assertIn("cursor", response.json())
+
+    def test_valid_cursor_still_pages(self):
+        next_url = self.client.get("/api/tasks/", {"ordering": "-due_date", "page_size": 5}).data["next"]
+        self.assertEqual(self.client.get(next_url).status_code, status.HTTP_200_OK)
+
+
+class TaskRankTests(SeededAPITestCase):
+    """Card order within a (board, status) column."""
+
+    def column(self, task_status):
+        return list(self.board.tasks.filter(status=task_status).order_by("rank", "id").values_list("pk", flat=True))
+
+    def move(self, task, **data):
+        return self.client.post(f"/api/tasks/{task.pk}/move/", data, format="json")
+
+    def test_column_loads_in_order_without_sorting(self):
+        plan = query_plan(self.board.tasks.filter(status="done").order_by("rank", "id"))
+        self.assertTrue(any("task_column_rank_idx (board_id=? AND status=?)" in step for step in plan), plan)
+        self.assertFalse(any("TEMP B-TREE" in step for step in plan), plan)
+
+    def test_move_within_column(self):
+        column = self.column(self.task.status)
+        task = Task.objects.get(pk=column[-1])
+        self.assertEqual(self.move(task, before_id=column[0]).status_code, status.HTTP_200_OK)
+        self.assertEqual(self.column(self.task.status), [task.pk] + column[:-1])
+        self.assertEqual(self.move(task, after_id=column[1]).status_code, status.HTTP_200_OK)
+        self.assertEqual(self.column(self.task.status), [column[0], column[1], task.pk] + column[2:-1])
+
+    def test_move_to_other_column(self):
+        target = next(value for value, _ in Task.STATUS_CHOICES if value != self.task.status)
+        column = self.column(target)
+        self.assertEqual(self.move(self.task, status=target).status_code, status.HTTP_200_OK)
+        self.assertEqual(self.column(target), column + [self.task.pk])
+        self.assertEqual(self.board.stats.task_count, self.board.tasks.count())
+
+    def test_status_update_appends_to_column(self):
+        target = next(value for value, _ in Task.STATUS_CHOICES if value != self.task.status)
+        column = self.column(target)
+        self.client.patch(f"/api/tasks/{self.task.pk}/", {"status": target}, format="json")
+        self.assertEqual(self.column(target), column + [self.task.pk])
+
+    def test_neighbour_outside_column(self):
+        other = self.board.tasks.exclude(status=self.task.status).first()
+        response = self.move(self.task, after_id=other.pk)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_equal_neighbour_keys_are_rebalanced(self):
+        first, second = self.column(self.task.status)[:2]
+        Task.objects.filter(pk=second).update(rank=Task.objects.get(pk=first).rank)
+        first, second, *rest = self.column(self.task.status)
+        task = Task.objects.get(pk=rest[-1])
+        self.assertEqual(self.move(task, after_id=first, before_id=second).status_code, status.HTTP_200_OK)
+        self.assertEqual(self.column(self.task.status), [first, task.pk, second] + rest[:-1])
+
+    def test_rebalance_keeps_order_and_shortens_keys(self):
+        column = self.column(self.task.status)
+        for pk in column:
+            Task.objects.filter(pk=pk).update(rank="zzzzzzzzzzzzzzzzzzzzzzzzzz" + Task.objects.get(pk=pk).rank)
+        self.assertEqual(Task.objects.long_rank_columns(24), {(self.board.pk, self.task.status)})
+        Task.objects.rebalance([(self.board.pk, self.task.status)])
+        self.assertEqual(self.column(self.task.status), column)
+        self.assertEqual(Task.objects.long_rank_columns(24), set())
+
+    def test_board_detail_in_rank_order(self):
+        task = Task.objects.get(pk=self.column(self.task.status)[-1])
+        self.move(task, before_id=self.column(self.task.status)[0])
+        tasks = self.client.get(f"/api/boards/{self.board.pk}/").data["tasks"]
+        ids = [item["id"] for item in tasks if item["status"] == self.task.status]
+        self.assertEqual(ids, self.column(self.task.status))
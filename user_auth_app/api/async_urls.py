@@ -0,0 +1,8 @@
+from django.urls import path
+
+from .async_views import login, registration
+
+urlpatterns = [
+    path('registration/', registration, name='registration-async'),
+    path('login/', login, name='login-async'),
+]
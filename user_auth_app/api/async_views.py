@@ -0,0 +1,45 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth import aauthenticate
+from rest_framework import serializers
+from rest_framework.authtoken.models import Token
+
+from core.async_api import api_response, async_api_view, request_data
+from user_auth_app.hashing import amake_password
+from .serializers import LoginCredentialsSerializer, RegistrationSerializer
+
+
+@async_api_view(authenticated=False)
+async def registration(request):
+    serializer = RegistrationSerializer(data=request_data(request))
+    if not serializer.is_valid():
+        return api_response(serializer.errors, status=400)
+    if serializer.validated_data["password"] != serializer.validated_data["repeated_password"]:
+        raise serializers.ValidationError({"error": "Passwords do not match"})
+
+    password_hash = await amake_password(serializer.validated_data["password"])
+    saved_account = await sync_to_async(serializer.save)(password_hash=password_hash)
+    token, created = await Token.objects.aget_or_create(user=saved_account)
+    return api_response({
+        "token": token.key,
+        "fullname": saved_account.username,
+        "email": saved_account.email,
+        "user_id": saved_account.id
+    }, status=201)
+
+
+@async_api_view(authenticated=False)
+async def login(request):
+    serializer = LoginCredentialsSerializer(data=request_data(request))
+    if not serializer.is_valid():
+        return api_response(serializer.errors, status=400)
+
+    user = await aauthenticate(request, **serializer.validated_data)
+    if not user:
+        return api_response({"error": ["Invalid email or password"]}, status=400)
+    token, created = await Token.objects.aget_or_create(user=user)
+    return api_response({
+        "token": token.key,
+        "fullname": user.username,
+        "email": user.email,
+        "user_id": user.id
+    }, status=200)
@@ -1,6 +1,9 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
 from django.contrib.auth import authenticate
+from django.db import IntegrityError, transaction
+
+from user_auth_app.lookups import email_exists
 
 class RegistrationSerializer(serializers.ModelSerializer):
     repeated_password = serializers.CharField(write_only=True)
@@ -13,7 +16,7 @@ class RegistrationSerializer(serializers.ModelSerializer):
             'password': {'write_only': True}
         }
 
-    def save(self):
+    def save(self, password_hash=None):
         pw = self.validated_data['password']
         repeated_pw = self.validated_data['repeated_password']
         fullname = self.validated_data['fullname']
@@ -22,31 +25,41 @@ class RegistrationSerializer(serializers.ModelSerializer):
         if pw != repeated_pw:
             raise serializers.ValidationError({'error': 'Passwords do not match'})
 
-        if User.objects.filter(email=email).exists():
+        if email_exists(email):
             raise serializers.ValidationError({'error': 'Email already exists'})
 
         account = User(
             username=fullname,
             email=email
         )
-        account.set_password(pw)
-        account.save()
+        if password_hash is None:
+            account.set_password(pw)
+        else:
+            account.password = password_hash
+        try:
+            with transaction.atomic():
+                account.save()
+        except IntegrityError:
+            # The email was registered concurrently, or the fullname (stored
+            # as the unique username) is taken.
+            if email_exists(email):
+                raise serializers.ValidationError({'error': 'Email already exists'})
+            if User.objects.filter(username=fullname).exists():
+                raise serializers.ValidationError({'error': 'Fullname already exists'})
+            raise
         return account
 
-class LoginSerializer(serializers.Serializer):
+class LoginCredentialsSerializer(serializers.Serializer):
     email = serializers.EmailField()
     password = serializers.CharField(write_only=True)
 
+class LoginSerializer(LoginCredentialsSerializer):
+
     def validate(self, data):
         email = data.get("email")
         password = data.get("password")
 
-        try:
-            user_obj = User.objects.get(email=email)
-        except User.DoesNotExist:
-            raise serializers.ValidationError({"error": "Invalid email or password"})
-
-        user = authenticate(username=user_obj.username, password=password)
+        user = authenticate(self.context.get("request"), email=email, password=password)
 
         if not user:
             raise serializers.ValidationError({"error": "Invalid email or password"})
@@ -62,4 +75,7 @@ class EmailCheckSerializer(serializers.ModelSerializer):
         fields = ["id", "email", "fullname"]
 
     def get_fullname(self, obj):
-        return obj.username
\ No newline at end of file
+        return obj.username
+
+class EmailBatchCheckSerializer(serializers.Serializer):
+    emails = serializers.ListField(child=serializers.EmailField(), allow_empty=False, max_length=200)
@@ -1,8 +1,10 @@
 from django.urls import path
-from .views import RegistrationView, LoginView, EmailCheckView
+from .views import RegistrationView, LoginView, LogoutView, EmailCheckView, EmailBatchCheckView
 
 urlpatterns = [
     path('registration/', RegistrationView.as_view(), name='registration'),
     path('login/', LoginView.as_view(), name='login'),
+    path('logout/', LogoutView.as_view(), name='logout'),
     path('email-check/', EmailCheckView.as_view(), name='email-check'),
+    path('email-check/batch/', EmailBatchCheckView.as_view(), name='email-check-batch'),
 ]
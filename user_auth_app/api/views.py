@@ -5,7 +5,8 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework import status
 from django.contrib.auth.models import User
-from .serializers import RegistrationSerializer, LoginSerializer, EmailCheckSerializer
+from user_auth_app.lookups import get_user_by_email, resolve_emails
+from .serializers import RegistrationSerializer, LoginSerializer, EmailCheckSerializer, EmailBatchCheckSerializer
 
 
 class RegistrationView(APIView):
@@ -31,7 +32,7 @@ class LoginView(APIView):
     permission_classes = [AllowAny]
 
     def post(self, request):
-        serializer = LoginSerializer(data=request.data)
+        serializer = LoginSerializer(data=request.data, context={"request": request})
 
         if serializer.is_valid():
             user = serializer.validated_data["user"]
@@ -46,6 +47,14 @@ class LoginView(APIView):
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+class LogoutView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        # Deleting the token drops it from the token caches (user_auth_app.signals).
+        request.auth.delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
 class EmailCheckView(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -55,9 +64,22 @@ class EmailCheckView(APIView):
             return Response({"detail": "E-Mail-Parameter fehlt."}, status=status.HTTP_400_BAD_REQUEST)
 
         try:
-            user = User.objects.get(email=email)
+            user = get_user_by_email(email)
         except User.DoesNotExist:
             return Response({"detail": "Email nicht gefunden."}, status=status.HTTP_404_NOT_FOUND)
 
         serializer = EmailCheckSerializer(user)
-        return Response(serializer.data, status=status.HTTP_200_OK)
\ No newline at end of file
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+class EmailBatchCheckView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        serializer = EmailBatchCheckSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        users, unknown = resolve_emails(serializer.validated_data["emails"])
+        return Response({
+            "found": EmailCheckSerializer(users, many=True).data,
+            "unknown": unknown,
+        }, status=status.HTTP_200_OK)
@@ -0,0 +1,114 @@
+import threading
+import time
+from collections import OrderedDict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.exceptions import AuthenticationFailed, NotAuthenticated
+
+
+class LRUCache:
+    """A small thread-safe LRU mapping whose entries expire after ``timeout`` seconds."""
+
+    def __init__(self, max_entries, timeout):
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.timeout)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+local_tokens = LRUCache(settings.TOKEN_CACHE_LOCAL_MAX_ENTRIES, settings.TOKEN_CACHE_LOCAL_TIMEOUT)
+
+
+def _cache_key(key):
+    return f"auth-token:{key}"
+
+
+def forget_tokens(keys):
+    keys = list(keys)
+    for key in keys:
+        local_tokens.delete(key)
+    cache.delete_many([_cache_key(key) for key in keys])
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """TokenAuthentication that resolves tokens from an in-process LRU, then
+    Django's cache, and only then from the database.
+
+    Entries are dropped when a token is saved or deleted (logout) and when its
+    user is saved (e.g. deactivated), see ``user_auth_app.signals``. That
+    happens in the current process and in Django's cache; other processes
+    drop their local LRU entry after ``TOKEN_CACHE_LOCAL_TIMEOUT`` seconds and
+    only see the cache entry go if the cache is shared (REDIS_URL). With the
+    default per-process cache, they see it expire after ``TOKEN_CACHE_TIMEOUT``.
+    """
+
+    def authenticate_credentials(self, key):
+        token = local_tokens.get(key)
+        if token is None:
+            token = cache.get(_cache_key(key))
+            if token is None:
+                try:
+                    token = self.get_model().objects.select_related("user").get(key=key)
+                except self.get_model().DoesNotExist:
+                    raise AuthenticationFailed("Invalid token.")
+                cache.set(_cache_key(key), token, settings.TOKEN_CACHE_TIMEOUT)
+            local_tokens.set(key, token)
+
+        if not token.user.is_active:
+            raise AuthenticationFailed("User inactive or deleted.")
+        return (token.user, token)
+
+    async def aauthenticate_credentials(self, key):
+        # A local LRU hit needs no database, so only hop to a thread on a miss.
+        token = local_tokens.get(key)
+        if token is not None and token.user.is_active:
+            return (token.user, token)
+        return await sync_to_async(self.authenticate_credentials)(key)
+
+
+def get_token_key(request, allow_query=False):
+    """Read the token from a plain Django request; ``allow_query`` also accepts
+    ?token= for clients such as EventSource that cannot send headers."""
+    header = request.headers.get("Authorization", "").split()
+    if len(header) == 2 and header[0] == "Token":
+        return header[1]
+    return request.GET.get("token") if allow_query else None
+
+
+async def aauthenticate(request, allow_query=False):
+    """Resolve the token user for native async views, raising like DRF would."""
+    key = get_token_key(request, allow_query)
+    if not key:
+        raise NotAuthenticated()
+    user, _ = await CachedTokenAuthentication().aauthenticate_credentials(key)
+    return user
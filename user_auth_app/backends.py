@@ -0,0 +1,35 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.models import User
+
+from .hashing import acheck_password, amake_password
+from .lookups import get_user_by_email
+
+
+class EmailBackend(ModelBackend):
+    """Authenticate with ``email`` and ``password`` through the case-insensitive email index."""
+
+    def authenticate(self, request, email=None, password=None, **kwargs):
+        if email is None or password is None:
+            return None
+        try:
+            user = get_user_by_email(email)
+        except User.DoesNotExist:
+            # Run the hasher anyway so unknown emails take as long as wrong passwords.
+            User().set_password(password)
+            return None
+        if user.check_password(password) and self.user_can_authenticate(user):
+            return user
+        return None
+
+    async def aauthenticate(self, request, email=None, password=None, **kwargs):
+        if email is None or password is None:
+            return None
+        try:
+            user = await sync_to_async(get_user_by_email)(email)
+        except User.DoesNotExist:
+            await amake_password(password)
+            return None
+        if await acheck_password(user, password) and self.user_can_authenticate(user):
+            return user
+        return None
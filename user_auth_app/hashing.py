@@ -0,0 +1,28 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password, verify_password
+
+# Password hashing is deliberately slow CPU work; async views run it here so it
+# never blocks the event loop, and the pool size caps how many hashes run at once.
+hash_pool = ThreadPoolExecutor(max_workers=settings.PASSWORD_HASHER_THREADS, thread_name_prefix="password-hasher")
+
+
+async def run_hasher(func, *args):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(hash_pool, functools.partial(func, *args))
+
+
+async def amake_password(raw_password):
+    return await run_hasher(make_password, raw_password)
+
+
+async def acheck_password(user, raw_password):
+    """Like ``user.acheck_password()``, which verifies on the event loop itself."""
+    is_correct, must_update = await run_hasher(verify_password, raw_password, user.password)
+    if is_correct and must_update:
+        user.password = await amake_password(raw_password)
+        await user.asave(update_fields=["password"])
+    return is_correct
@@ -0,0 +1,28 @@
+from django.contrib.auth.models import User
+from django.db.models.functions import Lower
+
+
+def normalize_email(email):
+    return email.strip().lower()
+
+
+def users_with_email():
+    # Matches the partial expression index user_auth_email_lower_uniq.
+    return User.objects.filter(email__gt="").alias(email_lower=Lower("email"))
+
+
+def get_user_by_email(email):
+    return users_with_email().get(email_lower=normalize_email(email))
+
+
+def email_exists(email):
+    return users_with_email().filter(email_lower=normalize_email(email)).exists()
+
+
+def resolve_emails(emails):
+    """Resolve many addresses with one IN query; return (users, unknown emails)."""
+    normalized = {normalize_email(email): email for email in emails}
+    users = list(users_with_email().filter(email_lower__in=normalized).annotate(email_key=Lower("email")))
+    found = {user.email_key for user in users}
+    unknown = [email for key, email in normalized.items() if key not in found]
+    return users, unknown
@@ -0,0 +1,19 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    # Unique, case-insensitive email index on the stock auth_user table. Blank
+    # emails (e.g. superusers created without one) are left out; lookups must
+    # repeat the ``email > ''`` predicate for SQLite to pick the partial index,
+    # see user_auth_app.lookups.
+    operations = [
+        migrations.RunSQL(
+            sql="CREATE UNIQUE INDEX user_auth_email_lower_uniq ON auth_user (LOWER(email)) WHERE email > ''",
+            reverse_sql="DROP INDEX user_auth_email_lower_uniq",
+        ),
+    ]
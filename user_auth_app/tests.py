@@ -1,3 +1,110 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from benchmarks.testing import SeededAPITestCase
+
+
+class AuthQueryBudgetTests(SeededAPITestCase):
+    """Query counts for login, registration and the email lookups."""
+
+    def test_login(self):
+        client = APIClient()
+        with self.assertNumQueries(2):
+            response = client.post(
+                "/api/login/", {"email": self.user.email.upper(), "password": "benchmark-password"}, format="json"
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["user_id"], self.user.pk)
+
+    def test_login_wrong_password(self):
+        client = APIClient()
+        with self.assertNumQueries(1):
+            response = client.post("/api/login/", {"email": self.user.email, "password": "falsch"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_registration(self):
+        client = APIClient()
+        data = {"fullname": "Neu", "email": "neu@example.com", "password": "pw", "repeated_password": "pw"}
+        # Including SAVEPOINT and RELEASE around the INSERT.
+        with self.assertNumQueries(8):
+            response = client.post("/api/registration/", data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_registration_duplicate_email(self):
+        client = APIClient()
+        data = {"fullname": "Neu", "email": self.user.email.upper(), "password": "pw", "repeated_password": "pw"}
+        with self.assertNumQueries(1):
+            response = client.post("/api/registration/", data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_registration_duplicate_fullname(self):
+        client = APIClient()
+        data = {"fullname": "Same Name", "email": "erste@example.com", "password": "pw", "repeated_password": "pw"}
+        self.assertEqual(client.post("/api/registration/", data, format="json").status_code, status.HTTP_201_CREATED)
+        response = client.post("/api/registration/", {**data, "email": "zweite@example.com"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, {"error": "Fullname already exists"})
+        self.assertFalse(User.objects.filter(email="zweite@example.com").exists())
+
+    def test_registration_concurrent_email(self):
+        # The email is free at the check but taken by the time of the INSERT.
+        client = APIClient()
+        data = {"fullname": "Neu", "email": self.user.email, "password": "pw", "repeated_password": "pw"}
+        with mock.patch("user_auth_app.api.serializers.email_exists", side_effect=[False, True]):
+            response = client.post("/api/registration/", data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, {"error": "Email already exists"})
+
+    def test_email_check(self):
+        other = self.data["users"][-1]
+        with self.assertNumQueries(2):
+            response = self.client.get(f"/api/email-check/?email={other.email}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["id"], other.pk)
+
+    def test_email_check_batch(self):
+        emails = [user.email for user in self.data["users"]] + ["niemand@example.com"]
+        with self.assertNumQueries(2):
+            response = self.client.post("/api/email-check/batch/", {"emails": emails}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["found"]), len(self.data["users"]))
+        self.assertEqual(response.data["unknown"], ["niemand@example.com"])
+
+
+class TokenRevocationTests(SeededAPITestCase):
+    """A cached token stops authenticating as soon as it is revoked."""
+
+    def setUp(self):
+        super().setUp()
+        self.key = self.user.auth_token.key
+        self.assertEqual(self.client.get("/api/boards/").status_code, status.HTTP_200_OK)
+
+    def test_logout(self):
+        self.assertEqual(self.client.post("/api/logout/").status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(self.client.get("/api/boards/").status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_token_deletion(self):
+        Token.objects.filter(key=self.key).delete()
+        self.assertEqual(self.client.get("/api/boards/").status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_token_rotation(self):
+        Token.objects.filter(key=self.key).delete()
+        token = Token.objects.create(user=self.user)
+        self.assertEqual(self.client.get("/api/boards/").status_code, status.HTTP_401_UNAUTHORIZED)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        self.assertEqual(self.client.get("/api/boards/").status_code, status.HTTP_200_OK)
+
+    def test_deactivated_user(self):
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get("/api/boards/").status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_logout_on_async_views(self):
+        headers = {"Authorization": f"Token {self.key}"}
+        self.assertEqual((await self.async_client.get("/api/tasks/", headers=headers)).status_code, status.HTTP_200_OK)
+        self.assertEqual((await self.async_client.post("/api/logout/", headers=headers)).status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual((await self.async_client.get("/api/tasks/", headers=headers)).status_code, status.HTTP_401_UNAUTHORIZED)